@@ -1,305 +1,142 @@
+import argparse
 import pygame
 import numpy as np
-import random
+from colors import WHITE, RED, BLACK
+from bullets import PROJECTILES
+from dirty_rects import DirtyRects
+from hud import game_hud
+from placement import PlacementMask
+from profiler import Profiler
+from sim_thread import SimThread, interpolate
+from simulation import SPEEDS, Simulation, path_points, ticks_due
+from sprite_cache import SpriteCache
+from targeting import PRIORITIES
+from towers import TOWER_TYPES
 
-# Initialize Pygame
-pygame.init()
-pygame.display.set_caption("Tower Defense")
 WIDTH, HEIGHT = 900, 720
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-clock = pygame.time.Clock()
+BACKGROUND = "#7a5f74"
+HUD_ONLY_SPEED = 16  # from this fast forward speed on enemies and bullets don't get drawn
 
-# Colors
-WHITE = (255, 255, 255)
-GREEN = (0, 255, 0)
-RED = (255, 0, 0)
-BLUE = (0, 128, 255)
-YELLOW = (255, 255, 0)
-BLACK = (0, 0, 0)
-ORANGE = (255, 128, 0)
-PURPLE = (128, 0, 255)
-GRAY = (200, 200, 200)
-
-# Path for enemies
-path_points = [(100, 100), (300, 100), (300, 300), (500, 300), (700, 500)]
-
-# Game variables
-currency = 100
-health = 10
-wave_number = 1
+# UI state, everything else lives in the Simulation
 selected_tower = None
-wave_started = False
-game_over = False
 paused = False
 dragging_tower = None  # Tower being dragged
-tower_cost = {"normal": 20, "splash": 50, "slow": 15}  # Tower costs
+show_profile = False  # F3, per phase frame times from the profiler
+speed = 1  # F cycles through SPEEDS
 
-# Font
-font = pygame.font.Font(None, 36)
+# Fonts, created once pygame is up
+font = None
+profile_font = None
 
 # Path drawing
 def draw_path(screen, path_points, color=BLACK, width=3):
     pygame.draw.lines(screen, color, False, path_points, width)
 
-# Check if a point is on the enemy path
-def is_on_path(x, y):
-    for i in range(len(path_points) - 1):
-        x1, y1 = path_points[i]
-        x2, y2 = path_points[i + 1]
-        # Check if the point is close to the line segment
-        if min(x1, x2) - 20 <= x <= max(x1, x2) + 20 and min(y1, y2) - 20 <= y <= max(y1, y2) + 20:
-            return True
-    return False
-
-# Classes for Enemy, Tower, and Bullet
-class Enemy:
-    def __init__(self, path, speed=0.5, health=75, color=RED):
-        self.path = path
-        self.pos = np.array(self.path[0], dtype=float)
-        self.speed = speed
-        self.base_speed = speed
-        self.health = health
-        self.current_point = 0
-        self.radius = 15
-        self.slow_timer = 0
-        self.color = color
-
-    def move(self):
-        if self.current_point < len(self.path) - 1:
-            target = np.array(self.path[self.current_point + 1], dtype=float)
-            direction = target - self.pos
-            distance = np.linalg.norm(direction)
-            if distance > 0:
-                direction /= distance
-            self.pos += direction * self.speed
-            if distance < self.speed:
-                self.current_point += 1
-            if self.slow_timer > 0:
-                self.slow_timer -= 1
-            else:
-                self.speed = self.base_speed
-
-    def draw(self, screen):
-        pygame.draw.circle(screen, self.color, (int(self.pos[0]), int(self.pos[1])), self.radius)
-
-    def is_alive(self):
-        return self.health > 0
-
-class Bullet:
-    def __init__(self, x, y, target, damage, origin_range, origin_pos, color, splash=False, splash_radius=0):
-        self.pos = np.array([x, y], dtype=float)
-        self.target = target
-        self.speed = 6.0
-        self.damage = damage
-        self.radius = 3
-        self.color = color
-        self.origin_pos = np.array(origin_pos, dtype=float)
-        self.origin_range = origin_range
-        self.splash = splash
-        self.splash_radius = splash_radius
-
-    def explode(self, enemies):
-        if self.splash:
-            for enemy in enemies:
-                if np.linalg.norm(enemy.pos - self.pos) <= self.splash_radius:
-                    enemy.health -= self.damage
-
-    def move(self):
-        direction = self.target.pos - self.pos
-        distance = np.linalg.norm(direction)
-        if distance > 0:
-            direction /= distance
-        self.pos += direction * self.speed
-
-    def draw(self, screen):
-        pygame.draw.circle(screen, self.color, (int(self.pos[0]), int(self.pos[1])), self.radius)
-
-    def has_collided(self):
-        distance = np.linalg.norm(self.target.pos - self.pos)
-        return distance <= self.radius + self.target.radius
-
-# Normal Tower
-class NormalTower:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.tower_type = "normal"
-        self.range = 100
-        self.fire_rate = 60
-        self.damage = 12
-        self.time_since_last_shot = 0
-        self.level = 1
-        self.upgrade_cost = 15
-        self.color = BLUE
-        self.upgrade_cooldown = 60
-        self.shape = "square"
-
-    def can_shoot(self, enemy):
-        dist = np.linalg.norm(np.array([self.x, self.y]) - enemy.pos)
-        return dist <= self.range
-
-    def shoot(self, enemies):
-        self.time_since_last_shot += 1
-        if self.time_since_last_shot >= self.fire_rate:
-            for enemy in enemies:
-                if self.can_shoot(enemy):
-                    self.time_since_last_shot = 0
-                    return Bullet(self.x, self.y, enemy, self.damage, self.range, (self.x, self.y), self.color)
-        return None
-
-    def upgrade(self):
-        global currency
-        if currency >= self.upgrade_cost:
-            currency -= self.upgrade_cost
-            self.level += 1
-            self.range += 35
-            self.damage += 18
-            self.upgrade_cost += 20
-            self.upgrade_cooldown = 60  # 1 second cooldown
-
-    def draw(self, screen, is_selected=False):
-        color = YELLOW if is_selected else self.color
-        pygame.draw.rect(screen, color, (self.x - 20, self.y - 20, 40, 40))
-        pygame.draw.circle(screen, GREEN, (self.x, self.y), self.range, 1)
-
-# Splash Tower
-class SplashTower:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.tower_type = "splash"
-        self.range = 95
-        self.fire_rate = 50
-        self.damage = 13
-        self.time_since_last_shot = 0
-        self.level = 1
-        self.upgrade_cost = 30
-        self.color = ORANGE
-        self.upgrade_cooldown = 60
-        self.shape = "circle"
-        self.splash_radius = 12
-
-    def can_shoot(self, enemy):
-        dist = np.linalg.norm(np.array([self.x, self.y]) - enemy.pos)
-        return dist <= self.range
-
-    def shoot(self, enemies):
-        self.time_since_last_shot += 1
-        if self.time_since_last_shot >= self.fire_rate:
-            for enemy in enemies:
-                if self.can_shoot(enemy):
-                    self.time_since_last_shot = 0
-                    return Bullet(self.x, self.y, enemy, self.damage, self.range, (self.x, self.y), self.color, splash=True, splash_radius=self.splash_radius)
-        return None
-
-    def upgrade(self):
-        global currency
-        if currency >= self.upgrade_cost:
-            currency -= self.upgrade_cost
-            self.level += 1
-            self.range += 9
-            self.damage += 7
-            self.upgrade_cost += 20
-            self.upgrade_cooldown = 60  # 1 second cooldown
-
-    def draw(self, screen, is_selected=False):
-        color = YELLOW if is_selected else self.color
-        pygame.draw.circle(screen, color, (self.x, self.y), 20)
-        pygame.draw.circle(screen, GREEN, (self.x, self.y), self.range, 1)
-
-# Slow Tower
-class SlowTower:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.tower_type = "slow"
-        self.range = 150
-        self.fire_rate = 37
-        self.damage = 7
-        self.time_since_last_shot = 0
-        self.level = 1
-        self.upgrade_cost = 25
-        self.color = PURPLE
-        self.upgrade_cooldown = 0
-        self.shape = "triangle"
-        self.slow_duration = 3600  # Frames
-        self.slow_amount = 0.65  # Slow by 50%
-
-    def can_shoot(self, enemy):
-        dist = np.linalg.norm(np.array([self.x, self.y]) - enemy.pos)
-        return dist <= self.range
-
-    def shoot(self, enemies):
-        self.time_since_last_shot += 1
-        if self.time_since_last_shot >= self.fire_rate:
-            for enemy in enemies:
-                if self.can_shoot(enemy):
-                    self.time_since_last_shot = 0
-                    enemy.speed *= self.slow_amount
-                    enemy.slow_timer = self.slow_duration
-                    return Bullet(self.x, self.y, enemy, self.damage, self.range, (self.x, self.y), self.color)
-        return None
-
-    def upgrade(self):
-        global currency
-        if currency >= self.upgrade_cost:
-            currency -= self.upgrade_cost
-            self.level += 1
-            self.range += 18
-            self.damage += 5
-            self.upgrade_cost += 20
-            self.upgrade_cooldown = 60  # 1 second cooldown
-
-    def draw(self, screen, is_selected=False):
-        color = YELLOW if is_selected else self.color
-        pygame.draw.polygon(screen, color, [(self.x, self.y - 20), (self.x - 20, self.y + 20), (self.x + 20, self.y + 20)])
-        pygame.draw.circle(screen, GREEN, (self.x, self.y), self.range, 1)
-
-def spawn_wave(wave_number):
-    enemies = []
-    for _ in range(wave_number * 2):
-        speed = random.uniform(0.3, 1.0)
-        health = random.randint(40, 80)
-        color = random.choice([RED, GREEN, BLUE])
-        enemies.append(Enemy(path_points, speed, health, color))
-    return enemies
-
-def draw_ui(screen, currency, health, wave_number, selected_tower):
-    # Draw currency, health, and wave number
-    currency_text = font.render(f"Currency: {currency}", True, BLACK)
-    health_text = font.render(f"Health: {health}", True, BLACK)
-    wave_text = font.render(f"Wave: {wave_number}", True, BLACK)
-    screen.blit(currency_text, (10, 10))
-    screen.blit(health_text, (10, 50))
-    screen.blit(wave_text, (10, 90))
-
-    # Draw upgrade info
-    if selected_tower:
-        upgrade_text = font.render(
-            f"Upgrade (U): Level {selected_tower.level} | Cost: {selected_tower.upgrade_cost}",
-            True, BLACK
-        )
-        screen.blit(upgrade_text, (10, HEIGHT - 30))
-
-    # Draw tower selection UI at the bottom
-    pygame.draw.rect(screen, GRAY, (0, HEIGHT - 100, WIDTH, 100))
-    # Normal tower
-    pygame.draw.rect(screen, BLUE, (50, HEIGHT - 80, 60, 60))
-    normal_tower_text = font.render(f"${tower_cost['normal']}", True, BLACK)
-    screen.blit(normal_tower_text, (60, HEIGHT - 20))
-    # Splash tower
-    pygame.draw.circle(screen, ORANGE, (200, HEIGHT - 50), 30)
-    splash_tower_text = font.render(f"${tower_cost['splash']}", True, BLACK)
-    screen.blit(splash_tower_text, (180, HEIGHT - 20))
-    # Slow tower
-    pygame.draw.polygon(screen, PURPLE, [(300, HEIGHT - 80), (270, HEIGHT - 20), (330, HEIGHT - 20)])
-    slow_tower_text = font.render(f"${tower_cost['slow']}", True, BLACK)
-    screen.blit(slow_tower_text, (290, HEIGHT - 20))
-
-    # Draw "Next Wave" button
-    pygame.draw.rect(screen, BLUE, (650, 10, 100, 40))
-    start_wave_text = font.render("Next Wave", True, WHITE)
-    screen.blit(start_wave_text, (660, 15))
+# Enemies, bullets and towers are drawn from pre-rasterized sprites, one blits per batch.
+# The blits calls hand back the rects they touched for dirty rect mode.
+sprites = SpriteCache()
+
+# Times every frame phase, the Simulation books its own tick phases into it
+profiler = Profiler()
+profile_overlay = None
+
+# Redrawn twice a second, percentiles don't need to be fresher than that
+def draw_profile(screen):
+    global profile_overlay
+    if profile_overlay is None or profiler.frames % 30 == 0:
+        profile_overlay = profiler.render(profile_font)
+    return screen.blit(profile_overlay, (WIDTH - profile_overlay.get_width() - 10, 60))
+
+# Everything that only changes when towers do: background, path, towers and their range rings
+def draw_static(screen, sim, selected_tower):
+    screen.fill(BACKGROUND)
+    draw_path(screen, sim.path)
+    screen.blits(sprites.towers(sim.towers, selected_tower), doreturn=False)
+
+def draw_dragging(screen, sim, dragging_tower):
+    rects = screen.blits(sprites.towers([dragging_tower]))
+    if not sim.is_valid_placement(dragging_tower.x, dragging_tower.y, dragging_tower.tower_type):
+        rects.append(pygame.draw.circle(screen, RED, (int(dragging_tower.x), int(dragging_tower.y)), 25, 3))
+    return rects
+
+# Full redraw, the whole window every frame. Without entities only the map, towers
+# and HUD get drawn (fast forward, see HUD_ONLY_SPEED).
+def draw_frame(screen, sim, hud, entities=True):
+    screen.fill(BACKGROUND)
+    draw_path(screen, sim.path)
+    profiler.lap("background")
+    if entities:
+        screen.blits(sprites.enemies(sim.enemies) + sprites.towers(sim.towers, selected_tower) + sprites.bullets(sim.bullets),
+                     doreturn=False)
+    else:
+        screen.blits(sprites.towers(sim.towers, selected_tower), doreturn=False)
+    profiler.lap("entities")
+
+    hud.draw(screen)
+    if show_profile:
+        draw_profile(screen)
+    profiler.lap("hud")
+
+    if dragging_tower:
+        draw_dragging(screen, sim, dragging_tower)
+        profiler.lap("entities")
+
+# Threaded mode, draws the last two snapshots of the sim thread blended by how far
+# into the current tick we are (see sim_thread.py)
+def draw_frame_threaded(screen, sim, runner, hud, entities=True):
+    prev, curr, alpha = runner.frame()
+    screen.fill(BACKGROUND)
+    draw_path(screen, curr.path)
+    profiler.lap("background")
+    if entities:
+        enemy_pos, bullet_pos = interpolate(prev, curr, alpha)
+        screen.blits(sprites.circles("enemy", enemy_pos, curr.enemy_color, curr.enemy_radius)
+                     + sprites.towers(curr.towers, selected_tower)
+                     + sprites.circles("bullet", bullet_pos, curr.bullet_color, curr.bullet_radius)
+                     + sprites.circles("bullet", curr.shot_pos, curr.shot_color, curr.bullet_radius), doreturn=False)
+    else:
+        screen.blits(sprites.towers(curr.towers, selected_tower), doreturn=False)
+    profiler.lap("entities")
+
+    hud.draw(screen)
+    if show_profile:
+        draw_profile(screen)
+    profiler.lap("hud")
+
+    if dragging_tower:
+        draw_dragging(screen, sim, dragging_tower)
+        profiler.lap("entities")
+
+def cycle_priority(tower):
+    i = PRIORITIES.index(tower.target_priority)
+    tower.target_priority = PRIORITIES[(i + 1) % len(PRIORITIES)]
+
+def cycle_projectile(tower):
+    i = PROJECTILES.index(tower.projectile)
+    tower.projectile = PROJECTILES[(i + 1) % len(PROJECTILES)]
+
+def build_static(screen, sim):
+    static = pygame.Surface(screen.get_size()).convert()
+    draw_static(static, sim, selected_tower)
+    return static
+
+# Dirty rect mode, see dirty_rects.py. Enemies and bullets end up drawn over the towers here.
+def draw_frame_dirty(screen, sim, hud, dirty, entities=True):
+    static_key = (sim.current_level, id(selected_tower),
+                  tuple((id(tower), tower.level, tower.range) for tower in sim.towers))
+    full = dirty.begin(screen, static_key, lambda: build_static(screen, sim))
+    dirty.restore(screen, hud.rects())
+    profiler.lap("background")
+
+    rects = screen.blits(sprites.enemies(sim.enemies) + sprites.bullets(sim.bullets)) if entities else []
+    if dragging_tower:
+        rects += draw_dragging(screen, sim, dragging_tower)
+    profiler.lap("entities")
+    hud.draw(screen)
+    if show_profile:
+        rects.append(draw_profile(screen))
+    profiler.lap("hud")
+    dirty.present(full, rects, hud.rects(), hud.version)
 
 def game_over_screen(screen):
     screen.fill(BLACK)
@@ -307,15 +144,29 @@ def game_over_screen(screen):
     screen.blit(game_over_text, (WIDTH // 2 - 150, HEIGHT // 2))
     pygame.display.update()
 
-def game_loop():
-    global currency, health, wave_number, selected_tower, wave_started, game_over, paused, dragging_tower
+# threaded runs the simulation on its own thread (see sim_thread.py), player actions
+# then go through its command queue instead of straight into the Simulation.
+# Fast forward only changes how many ticks run per frame, see ticks_due().
+def game_loop(screen, clock, sim, dirty_rects=False, threaded=False):
+    global selected_tower, paused, dragging_tower, show_profile, speed
     running = True
-    enemies = []
-    towers = []
-    bullets = []
+    accumulator = 0.0  # game time not yet turned into simulation ticks
+    dirty = DirtyRects() if dirty_rects and not threaded else None
+    runner = SimThread(sim) if threaded else None
+    if runner:
+        sim.profiler = None  # the profiler belongs to the render thread
+        act = runner.submit
+        runner.start()
+    else:
+        act = lambda fn, *args: fn(*args)
+    hud = game_hud(runner or sim, font, (WIDTH, HEIGHT), lambda: selected_tower, lambda: speed)
 
     while running:
-        screen.fill("#7a5f74")
+        # fixed timestep, the frame rate only decides how many ticks run per frame
+        accumulator += clock.tick(60) / 1000.0 * speed
+        profiler.start_frame()
+        towers = runner.latest.towers if runner else sim.towers
+        game_over = runner.latest.game_over if runner else sim.game_over
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -323,20 +174,14 @@ def game_loop():
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 x, y = event.pos
                 if event.button == 1:  # Left-click
+                    clicked = hud.hit(event.pos)
                     # Check if clicking on a tower in the UI
-                    if HEIGHT - 100 <= y <= HEIGHT:
-                        if 50 <= x <= 110:  # Normal tower
-                            if currency >= tower_cost["normal"]:
-                                dragging_tower = NormalTower(x, y)
-                        elif 170 <= x <= 230:  # Splash tower
-                            if currency >= tower_cost["splash"]:
-                                dragging_tower = SplashTower(x, y)
-                        elif 270 <= x <= 330:  # Slow tower
-                            if currency >= tower_cost["slow"]:
-                                dragging_tower = SlowTower(x, y)
+                    if clicked in TOWER_TYPES:
+                        if sim.can_afford(clicked):
+                            dragging_tower = TOWER_TYPES[clicked](x, y)
                     # Check if clicking on the "Next Wave" button
-                    if 650 <= x <= 750 and 10 <= y <= 50 and not wave_started:
-                        wave_started = True
+                    elif clicked == "next_wave":
+                        act(sim.start_wave)
                     # Check if clicking on a tower to select it
                     for tower in towers:
                         if np.linalg.norm(np.array([tower.x, tower.y]) - np.array([x, y])) <= 20:
@@ -345,84 +190,84 @@ def game_loop():
             elif event.type == pygame.MOUSEBUTTONUP:
                 if event.button == 1 and dragging_tower:
                     # Place the tower if the position is valid
-                    if not is_on_path(dragging_tower.x, dragging_tower.y):
-                        towers.append(dragging_tower)
-                        currency -= tower_cost[dragging_tower.tower_type]
+                    act(sim.place_tower, dragging_tower.tower_type, dragging_tower.x, dragging_tower.y)
                     dragging_tower = None
             elif event.type == pygame.MOUSEMOTION:
                 if dragging_tower:
                     dragging_tower.x, dragging_tower.y = event.pos
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_u and selected_tower:  # Upgrade tower
-                    selected_tower.upgrade()
+                    act(sim.upgrade_tower, selected_tower)
+                elif event.key == pygame.K_t and selected_tower:  # Cycle target priority
+                    act(cycle_priority, selected_tower)
+                elif event.key == pygame.K_m and selected_tower:  # Cycle projectile mode
+                    act(cycle_projectile, selected_tower)
                 elif event.key == pygame.K_p:  # Pause game
                     paused = not paused
+                    if runner:
+                        runner.paused = paused
+                elif event.key == pygame.K_f:  # Fast forward
+                    speed = SPEEDS[(SPEEDS.index(speed) + 1) % len(SPEEDS)]
+                    if runner:
+                        runner.speed = speed
+                elif event.key == pygame.K_F3:  # Frame profiler overlay
+                    show_profile = not show_profile
                 elif event.key == pygame.K_r and game_over:  # Restart game
-                    game_over = False
-                    health = 10
-                    currency = 100
-                    wave_number = 1
-                    enemies = []
-                    towers = []
-                    bullets = []
-
-        if not paused and not game_over:
-            if wave_started and not enemies:
-                enemies.extend(spawn_wave(wave_number))
-                wave_number += 1
-                wave_started = False
-
-            for enemy in enemies[:]:
-                enemy.move()
-                if enemy.health <= 0:
-                    enemies.remove(enemy)
-                    currency += 10
-                elif enemy.current_point == len(enemy.path) - 1:
-                    enemies.remove(enemy)
-                    health -= 1
-
-            if health <= 0:
-                game_over = True
-
-            for tower in towers:
-                if tower.upgrade_cooldown > 0:
-                    tower.upgrade_cooldown -= 1
-                bullet = tower.shoot(enemies)
-                if bullet:
-                    bullets.append(bullet)
+                    act(sim.reset)
+                    selected_tower = None
 
-            for bullet in bullets[:]:
-                bullet.move()
-                if bullet.has_collided():
-                    if bullet.splash:
-                        bullet.explode(enemies)
-                    bullet.target.health -= bullet.damage
-                    bullets.remove(bullet)
-                elif not bullet.target.is_alive() or np.linalg.norm(bullet.pos - bullet.origin_pos) > bullet.origin_range:
-                    bullets.remove(bullet)
+        profiler.lap("events")
 
-        draw_path(screen, path_points)
-        for enemy in enemies:
-            enemy.draw(screen)
-        for tower in towers:
-            tower.draw(screen, is_selected=(tower == selected_tower))
-        for bullet in bullets:
-            bullet.draw(screen)
-
-        draw_ui(screen, currency, health, wave_number, selected_tower)
-
-        if dragging_tower:
-            dragging_tower.draw(screen)
-            if is_on_path(dragging_tower.x, dragging_tower.y):
-                pygame.draw.circle(screen, RED, (int(dragging_tower.x), int(dragging_tower.y)), 25, 3)
+        if not runner:
+            ticks, accumulator = ticks_due(accumulator, speed)
+            if not paused:
+                sim.step(ticks)
+            game_over = sim.game_over
 
         if game_over:
             game_over_screen(screen)
-
-        pygame.display.update()
-        clock.tick(60)
-
+            if dirty:
+                dirty.invalidate()  # full redraw after the restart
+        elif runner:
+            draw_frame_threaded(screen, sim, runner, hud, speed < HUD_ONLY_SPEED)
+            pygame.display.update()
+        elif dirty:
+            draw_frame_dirty(screen, sim, hud, dirty, speed < HUD_ONLY_SPEED)
+        else:
+            draw_frame(screen, sim, hud, speed < HUD_ONLY_SPEED)
+            pygame.display.update()
+        profiler.lap("flip")
+
+    if runner:
+        runner.stop()
     pygame.quit()
 
-# Run the game loop
-game_loop()
\ No newline at end of file
+def main():
+    global font, profile_font
+    parser = argparse.ArgumentParser(description="Tower Defense")
+    parser.add_argument("--seed", type=int, default=None, help="replay a game with this RNG seed")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="only redraw and update the parts of the window that changed (faster on slow machines)")
+    parser.add_argument("--threaded", action="store_true",
+                        help="run the simulation on its own thread, drawing interpolates between ticks (no --dirty-rects)")
+    parser.add_argument("--profile-csv", metavar="PATH", default=None,
+                        help="write the per phase frame times (last %d frames) to PATH on exit" % len(profiler.samples))
+    args = parser.parse_args()
+
+    # Initialize Pygame
+    pygame.init()
+    pygame.display.set_caption("Tower Defense")
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    clock = pygame.time.Clock()
+    font = pygame.font.Font(None, 36)
+    profile_font = pygame.font.SysFont("monospace", 14)
+    sim = Simulation(placement_masks=[PlacementMask((WIDTH, HEIGHT), path_points)], seed=args.seed)
+    sim.profiler = profiler
+    print(f"seed: {sim.seed}")
+    game_loop(screen, clock, sim, args.dirty_rects, args.threaded)
+    if args.profile_csv:
+        profiler.dump(args.profile_csv)
+        print(f"frame profile: {args.profile_csv}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import argparse
+import os
+import random
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+from simulation import Simulation, tower_cost
+
+# Scripted tower layouts for the default path, towers get built in this order
+# as soon as there's money for them. Every spot is off the path.
+LAYOUTS = {
+    "normal_line": [("normal", 200, 150), ("normal", 250, 170), ("normal", 360, 200),
+                    ("normal", 350, 250), ("normal", 400, 350), ("normal", 250, 250)],
+    "splash_cluster": [("splash", 360, 200), ("splash", 400, 230), ("splash", 350, 250),
+                       ("splash", 450, 250), ("splash", 400, 350)],
+    "slow_support": [("slow", 360, 200), ("normal", 250, 170), ("normal", 350, 250),
+                     ("slow", 400, 350), ("normal", 450, 250), ("normal", 200, 150)],
+    "mixed": [("normal", 250, 170), ("slow", 360, 200), ("splash", 400, 230),
+              ("normal", 350, 250), ("splash", 450, 250), ("normal", 400, 350)],
+}
+
+TICKS_PER_CHECK = 60  # how often the runner looks whether a wave is cleared
+MAX_TICKS_PER_WAVE = 60 * 60 * 10
+
+
+# Builds whatever the layout still has left, then spends the rest on upgrades
+# (cheapest upgrade first) using each tower's own upgrade() rules.
+def spend(sim, build_order):
+    while build_order and sim.can_afford(build_order[0][0]):
+        tower_type, x, y = build_order.pop(0)
+        sim.place_tower(tower_type, x, y)
+    if build_order:
+        return  # saving up for the next tower
+    while sim.towers:
+        tower = min(sim.towers, key=lambda tower: tower.upgrade_cost)
+        if sim.currency < tower.upgrade_cost:
+            break
+        sim.upgrade_tower(tower)
+
+
+# Plays one full game headless and returns its per-wave curves
+def play(job):
+    layout, seed, max_waves, costs = job
+    sim = Simulation(tower_cost=costs, seed=seed)
+    build_order = list(LAYOUTS[layout])
+    currency = np.full(max_waves, -1, dtype=np.int32)
+    health = np.full(max_waves, -1, dtype=np.int32)
+    leaks = 0
+
+    for wave in range(max_waves):
+        spend(sim, build_order)
+        health_before = sim.health
+        sim.start_wave()
+        ticks = 0
+        while sim.wave_active and not sim.game_over and ticks < MAX_TICKS_PER_WAVE:
+            sim.step(TICKS_PER_CHECK)
+            ticks += TICKS_PER_CHECK
+        leaks += health_before - max(sim.health, 0)
+        currency[wave] = sim.currency
+        health[wave] = max(sim.health, 0)
+        if sim.game_over:
+            break
+
+    return layout, seed, wave + 1, leaks, currency, health
+
+
+def parse_costs(overrides):
+    costs = dict(tower_cost)
+    for override in overrides:
+        tower_type, _, price = override.partition("=")
+        if tower_type not in costs or not price.isdigit():
+            raise SystemExit(f"bad --cost {override!r}, expected e.g. splash=45")
+        costs[tower_type] = int(price)
+    return costs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plays lots of headless games to check wave balance")
+    parser.add_argument("--runs", type=int, default=1000, help="games per layout")
+    parser.add_argument("--layouts", nargs="+", default=list(LAYOUTS), choices=list(LAYOUTS))
+    parser.add_argument("--max-waves", type=int, default=30)
+    parser.add_argument("--cost", action="append", default=[], metavar="TYPE=PRICE",
+                        help="override a tower price, e.g. --cost splash=45")
+    parser.add_argument("--seed", type=int, default=None, help="base seed, the run seeds are drawn from it")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--out", default="balance_results.npz")
+    args = parser.parse_args()
+
+    costs = parse_costs(args.cost)
+    seeds = random.Random(args.seed).sample(range(2 ** 32), args.runs)
+    jobs = [(layout, seed, args.max_waves, costs) for layout in args.layouts for seed in seeds]
+
+    start = time.perf_counter()
+    with Pool(args.workers) as pool:
+        results = list(pool.imap_unordered(play, jobs, chunksize=max(1, len(jobs) // (args.workers * 8))))
+    elapsed = time.perf_counter() - start
+    results.sort(key=lambda result: (args.layouts.index(result[0]), result[1]))
+
+    layout_idx = np.array([args.layouts.index(result[0]) for result in results], dtype=np.int8)
+    survived = np.array([result[2] for result in results], dtype=np.int16)
+    leaks = np.array([result[3] for result in results], dtype=np.int32)
+    np.savez_compressed(
+        args.out,
+        layouts=np.array(args.layouts),
+        layout=layout_idx,
+        seed=np.array([result[1] for result in results], dtype=np.uint32),
+        survival_wave=survived,
+        leaks=leaks,
+        currency=np.stack([result[4] for result in results]),
+        health=np.stack([result[5] for result in results]),
+        tower_cost=np.array([costs[name] for name in tower_cost]),
+    )
+
+    print(f"{len(jobs)} games in {elapsed:.1f}s ({len(jobs) / elapsed * 60:.0f} games/min) -> {args.out}")
+    for i, layout in enumerate(args.layouts):
+        mine = layout_idx == i
+        print(f"{layout:>16}: survival wave {survived[mine].mean():5.2f} "
+              f"(min {survived[mine].min()}, max {survived[mine].max()}), leaks {leaks[mine].mean():.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import argparse
+import json
+import time
+
+from path import Path
+from profiler import Profiler
+from simulation import Simulation, spawn_wave
+
+TICK_PHASES = ("spawn", "enemies", "towers", "bullets")
+
+# name: (wave number, so 2x that many enemies from spawn_wave, tower type, towers, projectile)
+SCENARIOS = {
+    "enemies_10": (5, "normal", 8, "bullet"),
+    "enemies_100": (50, "normal", 8, "bullet"),
+    "enemies_1k": (500, "normal", 8, "bullet"),
+    "enemies_10k": (5000, "normal", 8, "bullet"),
+    "splash_cluster": (500, "splash", 60, "bullet"),
+    "slow_heavy": (500, "slow", 60, "bullet"),
+    "hitscan_1k": (500, "normal", 60, "hitscan"),
+    "timed_1k": (500, "normal", 60, "timed"),
+    "bullets_1k": (500, "normal", 60, "bullet"),  # what hitscan_1k and timed_1k get compared to
+    "idle_towers": (5, "normal", 150, "bullet"),  # every spot near the path taken, most towers with nothing in range
+}
+
+WARMUP_TICKS = 30
+TICKS = 300
+
+
+# Tower spots on a 40px grid (so footprints never overlap), closest to the path
+# first, that are valid placements and actually reach the path.
+def tower_spots(sim, tower_type, count, size=(900, 620)):
+    path = Path(sim.path)
+    spots = []
+    for x in range(20, size[0], 40):
+        for y in range(20, size[1], 40):
+            if sim.is_valid_placement(x, y, tower_type):
+                reach = path.coverage(x, y, 100)
+                if len(reach):
+                    spots.append((-(reach[:, 1] - reach[:, 0]).sum(), x, y))
+    spots.sort()
+    return [(x, y) for _, x, y in spots[:count]]
+
+
+def build(name, seed):
+    wave, tower_type, towers, projectile = SCENARIOS[name]
+    sim = Simulation(currency=10 ** 9, health=10 ** 9, seed=seed)
+    for x, y in tower_spots(sim, tower_type, towers):
+        sim.place_tower(tower_type, x, y).projectile = projectile
+    # the whole wave at once, so the enemy count is what the scenario says from the first tick
+    sim.enemies.extend(spawn_wave(wave, sim.rng))
+    return sim
+
+
+# Runs one scenario, returns ticks per second and the mean cost of every tick phase in microseconds
+def run(name, seed, ticks=TICKS):
+    sim = build(name, seed)
+    sim.step(WARMUP_TICKS)
+    profiler = Profiler(TICK_PHASES, frames=ticks)
+    sim.profiler = profiler
+    enemies = 0
+    start = time.perf_counter()
+    for _ in range(ticks):
+        profiler.start_frame()
+        sim.tick()
+        enemies += sim.enemies.count
+    elapsed = time.perf_counter() - start
+    phases = profiler.history().mean(axis=0) * 1e6
+    return {
+        "ticks_per_s": ticks / elapsed,
+        "phases_us": {phase: round(float(us), 2) for phase, us in zip(TICK_PHASES, phases)},
+        "enemies": enemies // ticks,
+        "towers": len(sim.towers),
+        "checksum": sim.checksum(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless performance benchmark of the simulation")
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--ticks", type=int, default=TICKS, help="timed ticks per run")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per scenario, the fastest counts")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--save", metavar="PATH", help="write the results as a baseline JSON")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a saved baseline, exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="allowed ticks/s drop against the baseline (0.15 = 15%%)")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'scenario':>15} {'enemies':>8} {'towers':>7} {'ticks/s':>9}  " + " ".join(f"{phase:>9}" for phase in TICK_PHASES))
+    for name in args.scenarios:
+        runs = [run(name, args.seed, args.ticks) for _ in range(args.repeat)]
+        result = results[name] = max(runs, key=lambda result: result["ticks_per_s"])
+        print(f"{name:>15} {result['enemies']:>8} {result['towers']:>7} {result['ticks_per_s']:>9.0f}  "
+              + " ".join(f"{result['phases_us'][phase]:>7.0f}us" for phase in TICK_PHASES))
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"seed": args.seed, "ticks": args.ticks, "results": results}, f, indent=2)
+        print(f"baseline -> {args.save}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = 0
+        print(f"\n{'scenario':>15} {'baseline':>9} {'now':>9} {'change':>8}")
+        for name, result in results.items():
+            if name not in baseline:
+                continue
+            before, now = baseline[name]["ticks_per_s"], result["ticks_per_s"]
+            change = now / before - 1.0
+            flag = ""
+            if change < -args.tolerance:
+                flag = "  REGRESSION"
+                regressions += 1
+            if baseline[name]["checksum"] != result["checksum"]:
+                flag += "  (game state differs, scenario or rules changed)"
+            print(f"{name:>15} {before:>9.0f} {now:>9.0f} {change:>+8.1%}{flag}")
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+import heapq
+import math
+from collections import deque
+
+import numpy as np
+
+# How a tower's shots get to their target, see BulletPool.fire()
+PROJECTILES = ("bullet", "hitscan", "timed")
+FLASH_TICKS = 4  # a hitscan hit stays on screen this long
+
+
+# Every bullet in flight is a slot in a set of preallocated numpy columns.
+# Fired bullets take a slot off the free list and give it back when they hit or
+# get culled, so nothing is allocated per shot and the whole pool moves,
+# collides and gets culled in a few array ops per frame.
+#
+# Hitscan and timed shots never become bullets. They go into a heap of damage
+# events ordered by the tick they land on, update() lands the ones that are due.
+class BulletPool:
+    columns = ("pos", "origin_pos", "target", "damage", "origin_range", "splash_radius", "color", "active")
+
+    def __init__(self, capacity=512):
+        self.speed = 6.0
+        self.radius = 3
+        self.pos = np.zeros((capacity, 2))
+        self.origin_pos = np.zeros((capacity, 2))
+        self.target = np.zeros(capacity, dtype=np.int64)  # handle of the enemy, see registry.py
+        self.damage = np.zeros(capacity)
+        self.origin_range = np.zeros(capacity)
+        self.splash_radius = np.zeros(capacity)  # 0 means no splash
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.free = list(range(capacity - 1, -1, -1))
+        self.scheduled = []  # heap of (tick, seq, target handle, damage, splash radius, fired tick, origin, aim, color)
+        self.flashes = deque()  # (until tick, pos, color) of hitscan hits
+        self.sequence = 0  # breaks ties between shots landing on the same tick, in firing order
+        self.now = 0
+
+    def __len__(self):
+        return len(self.active) - len(self.free)
+
+    def _grow(self):
+        capacity = len(self.active)
+        for name in self.columns:
+            old = getattr(self, name)
+            new = np.zeros((capacity * 2,) + old.shape[1:], dtype=old.dtype)
+            new[:capacity] = old
+            setattr(self, name, new)
+        self.free.extend(range(capacity * 2 - 1, capacity - 1, -1))
+
+    def spawn(self, x, y, target, damage, origin_range, color, splash_radius=0):
+        if not self.free:
+            self._grow()
+        slot = self.free.pop()
+        self.pos[slot] = (x, y)
+        self.origin_pos[slot] = (x, y)
+        self.target[slot] = target
+        self.damage[slot] = damage
+        self.origin_range[slot] = origin_range
+        self.splash_radius[slot] = splash_radius
+        self.color[slot] = color
+        self.active[slot] = True
+        return slot
+
+    # Fires at row i of enemies. A "bullet" flies and homes in (spawn), "hitscan" lands on
+    # this tick and "timed" works out the tick a bullet would get there (Path.intercept) and
+    # lands on that one without simulating the flight. A timed shot whose target leaks or
+    # gets out of range before that is a miss, just like a bullet would be.
+    def fire(self, mode, x, y, enemies, i, damage, origin_range, color, splash_radius=0):
+        if mode == "bullet":
+            return self.spawn(x, y, enemies.handle[i], damage, origin_range, color, splash_radius)
+        now = enemies.effects.now
+        due, aim = now, enemies.pos[i]
+        if mode == "timed":
+            t = enemies.path.intercept(enemies.travelled[i], enemies.speed[i], (x, y), self.speed,
+                                       self.radius + enemies.radius)
+            if t is None or t * self.speed > origin_range:
+                return None
+            due = now + max(math.ceil(t), 1)
+            aim = enemies.path.positions(np.array([enemies.travelled[i] + enemies.speed[i] * t]))[0]
+        heapq.heappush(self.scheduled, (due, self.sequence, int(enemies.handle[i]), float(damage), float(splash_radius),
+                                        now, (float(x), float(y)), (float(aim[0]), float(aim[1])), tuple(color)))
+        self.sequence += 1
+        return None
+
+    def release(self, slots):
+        self.active[slots] = False
+        self.free.extend(slots.tolist())
+
+    def clear(self):
+        self.active[:] = False
+        self.free = list(range(len(self.active) - 1, -1, -1))
+        self.scheduled = []
+        self.flashes.clear()
+        self.sequence = 0
+        self.now = 0
+
+    def slots(self):
+        return np.flatnonzero(self.active)
+
+    # Timed shots in flight (moved along from the tower to where they meet their target)
+    # and recent hitscan hits, as (pos, color) arrays for drawing
+    def shots(self):
+        pos, colors = [], []
+        for due, _, _, _, _, fired, (x0, y0), (x1, y1), color in self.scheduled:
+            if due > fired:
+                along = (self.now - fired) / (due - fired)
+                pos.append((x0 + (x1 - x0) * along, y0 + (y1 - y0) * along))
+                colors.append(color)
+        for _, xy, color in self.flashes:
+            pos.append(xy)
+            colors.append(color)
+        return np.array(pos, dtype=float).reshape(-1, 2), np.array(colors, dtype=np.uint8).reshape(-1, 3)
+
+    # Direct damage on the targets (rows), splash around pos through the grid
+    def _damage(self, enemies, grid, rows, pos, damage, splash_radius):
+        splash = splash_radius > 0
+        if splash.any():
+            center_idx, enemy_idx, _ = grid.query_pairs(pos[splash], splash_radius[splash])
+            np.subtract.at(enemies.health, enemy_idx, damage[splash][center_idx])
+        np.subtract.at(enemies.health, rows, damage)
+
+    # Lands the hitscan and timed shots due on this tick, a target that's gone by then is a miss
+    def land(self, enemies, grid):
+        now = self.now = enemies.effects.now
+        while self.flashes and self.flashes[0][0] < now:
+            self.flashes.popleft()
+        due = []
+        while self.scheduled and self.scheduled[0][0] <= now:
+            due.append(heapq.heappop(self.scheduled))
+        if not due:
+            return
+        target = enemies.resolve([shot[2] for shot in due])
+        hit = target >= 0
+        rows = target[hit]
+        pos = enemies.pos[rows]
+        damage = np.array([shot[3] for shot in due])[hit]
+        splash_radius = np.array([shot[4] for shot in due])[hit]
+        self._damage(enemies, grid, rows, pos, damage, splash_radius)
+        landed = [shot for shot, ok in zip(due, hit) if ok]
+        for shot, xy in zip(landed, pos.tolist()):
+            if shot[0] == shot[5]:  # hitscan
+                self.flashes.append((now + FLASH_TICKS, tuple(xy), shot[8]))
+
+    def update(self, enemies, grid):
+        self.land(enemies, grid)
+        slots = self.slots()
+        if len(slots) == 0:
+            return
+        # target handles to rows, a dead target doesn't resolve any more and its bullet is dropped
+        target = enemies.resolve(self.target[slots])
+        lost = target < 0
+        if lost.any():
+            self.release(slots[lost])
+            slots, target = slots[~lost], target[~lost]
+            if len(slots) == 0:
+                return
+        target_pos = enemies.pos[target]
+
+        # move: home in on the target
+        direction = target_pos - self.pos[slots]
+        distance = np.hypot(direction[:, 0], direction[:, 1])
+        step = np.where(distance > 0, self.speed / np.where(distance > 0, distance, 1.0), 0.0)
+        pos = self.pos[slots] + direction * step[:, None]
+        self.pos[slots] = pos
+
+        # collide: direct damage on the target, splash through the grid
+        offset = target_pos - pos
+        hit = np.einsum("ij,ij->i", offset, offset) <= (self.radius + enemies.radius) ** 2
+        self._damage(enemies, grid, target[hit], pos[hit], self.damage[slots][hit], self.splash_radius[slots][hit])
+
+        # cull: spent, target died or flew out of the tower's range
+        offset = pos - self.origin_pos[slots]
+        flown = np.einsum("ij,ij->i", offset, offset) > self.origin_range[slots] ** 2
+        gone = hit | (enemies.health[target] <= 0) | flown
+        self.release(slots[gone])
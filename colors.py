@@ -0,0 +1,10 @@
+# Colors
+WHITE = (255, 255, 255)
+GREEN = (0, 255, 0)
+RED = (255, 0, 0)
+BLUE = (0, 128, 255)
+YELLOW = (255, 255, 0)
+BLACK = (0, 0, 0)
+ORANGE = (255, 128, 0)
+PURPLE = (128, 0, 255)
+GRAY = (200, 200, 200)
@@ -0,0 +1,52 @@
+import pygame
+
+
+# Dirty rectangle rendering. Everything that doesn't move (map, path, towers,
+# range rings) gets drawn once into a static layer. Each frame only the spots
+# the moving stuff covered last frame get restored from that layer, and only
+# the rects that actually changed get pushed to the display.
+#
+#   full = dirty.begin(screen, static_key, build_static)
+#   dirty.restore(screen, hud_rects)        # the HUD gets redrawn on top every frame
+#   ... draw entities, collect their rects ...
+#   ... draw the HUD ...
+#   dirty.present(full, entity_rects, hud_rects, hud_key)
+#
+# static_key is anything comparable that changes whenever the static layer has to
+# be rebuilt (a tower placed, upgraded or selected, a new level...). hud_key does
+# the same for the HUD values, its rects only get pushed when it changes.
+class DirtyRects:
+    def __init__(self):
+        self.static = None
+        self.static_key = None
+        self.hud_key = None
+        self.previous = []  # entity rects drawn last frame
+
+    def invalidate(self):
+        self.static_key = None
+
+    # Restores last frame's entity rects, or the whole screen if the static layer changed.
+    # Returns True when this is a full redraw.
+    def begin(self, screen, static_key, build_static):
+        if self.static is None or static_key != self.static_key:
+            self.static = build_static()
+            self.static_key = static_key
+            screen.blit(self.static, (0, 0))
+            self.previous = []
+            return True
+        self.restore(screen, self.previous)
+        return False
+
+    def restore(self, screen, rects):
+        screen.blits([(self.static, rect, rect) for rect in rects], doreturn=False)
+
+    def present(self, full, rects, hud_rects=(), hud_key=None):
+        if full:
+            pygame.display.update()
+        else:
+            changed = self.previous + rects
+            if hud_key != self.hud_key:
+                changed += hud_rects
+            pygame.display.update(changed)
+        self.previous = rects
+        self.hud_key = hud_key
@@ -0,0 +1,88 @@
+BURN_INTERVAL = 30  # burn damage lands in chunks this many ticks apart
+
+
+# Status effects (slow, stun, burn) of the enemies in an EnemyTable.
+# The state of every effect sits in the table's own columns (slow_factor, slow_until,
+# stun_until, burn_dps, burn_until), so it moves along when rows get culled. When an
+# effect has to end or tick again an entry goes into a timer wheel with one slot per
+# tick, advance() only looks at the slot of the current tick. Nothing runs per enemy
+# per tick, the cost is per effect that starts, ticks or ends.
+#
+# Stacking: the strongest slow wins, a slow as strong as the current one refreshes its
+# duration and weaker ones are ignored, so slows never compound. Stuns and burns take
+# the longest duration, burns the highest damage.
+#
+# Wheel entries hold the enemy's handle instead of its row since rows move on every cull.
+# Entries of enemies that are gone, or whose effect got refreshed since, are dropped
+# when their slot comes up.
+class StatusEffects:
+    def __init__(self, enemies):
+        self.enemies = enemies
+        self.now = 0
+        self.wheel = {}  # tick -> [(handle, effect), ...]
+
+    def clear(self):
+        self.now = 0
+        self.wheel = {}
+
+    def schedule(self, tick, row, effect):
+        self.wheel.setdefault(tick, []).append((int(self.enemies.handle[row]), effect))
+
+    def slow(self, row, factor, duration):
+        enemies = self.enemies
+        until = self.now + duration
+        if factor < enemies.slow_factor[row] or enemies.slow_until[row] <= self.now:
+            enemies.slow_factor[row] = factor
+        elif factor > enemies.slow_factor[row] or until <= enemies.slow_until[row]:
+            return
+        enemies.slow_until[row] = until
+        self.schedule(until, row, "slow")
+        self.refresh_speed(row)
+
+    def stun(self, row, duration):
+        enemies = self.enemies
+        until = self.now + duration
+        if until <= enemies.stun_until[row]:
+            return
+        enemies.stun_until[row] = until
+        self.schedule(until, row, "stun")
+        self.refresh_speed(row)
+
+    # dps is damage per tick
+    def burn(self, row, dps, duration):
+        enemies = self.enemies
+        burning = enemies.burn_until[row] > self.now
+        enemies.burn_dps[row] = max(enemies.burn_dps[row], dps) if burning else dps
+        enemies.burn_until[row] = max(enemies.burn_until[row], self.now + duration)
+        if not burning:
+            self.schedule(self.now + BURN_INTERVAL, row, "burn")
+
+    def refresh_speed(self, row):
+        enemies = self.enemies
+        stunned = enemies.stun_until[row] > self.now
+        enemies.speed[row] = 0.0 if stunned else enemies.base_speed[row] * enemies.slow_factor[row]
+
+    # Runs whatever is due on tick now
+    def advance(self, now):
+        self.now = now
+        due = self.wheel.pop(now, None)
+        if not due:
+            return
+        enemies = self.enemies
+        for handle, effect in due:
+            row = enemies.row_of(handle)
+            if row < 0:
+                continue
+            if effect == "slow":
+                if enemies.slow_until[row] == now:
+                    enemies.slow_factor[row] = 1.0
+                    self.refresh_speed(row)
+            elif effect == "stun":
+                if enemies.stun_until[row] == now:
+                    self.refresh_speed(row)
+            elif effect == "burn":
+                enemies.health[row] -= enemies.burn_dps[row] * BURN_INTERVAL
+                if enemies.burn_until[row] > now:
+                    self.schedule(now + BURN_INTERVAL, row, "burn")
+                else:
+                    enemies.burn_dps[row] = 0.0
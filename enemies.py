@@ -0,0 +1,156 @@
+import numpy as np
+
+from colors import RED
+from effects import StatusEffects
+from path import Path
+from registry import Registry
+
+
+# All enemies of a wave live in one table of numpy columns (one row per enemy)
+# instead of a list of Enemy objects, so moving the whole wave is a handful of
+# array ops no matter how many enemies there are.
+# An enemy's only real position is how far it got along the path (travelled),
+# pos is worked out from that every move for drawing and range checks.
+# order holds the rows sorted by travelled (progress, ascending) and progress the
+# matching distances, so "first" / "last" targeting is a searchsorted, see targeting.py.
+# Slows, stuns and burns are handled by effects (see effects.py), speed is the
+# current speed with those applied.
+# Rows move when others get culled (swap-remove), anything that has to keep track of
+# one enemy (bullets, effects) holds its handle instead, see registry.py.
+class EnemyTable:
+    columns = ("pos", "speed", "base_speed", "health", "color", "travelled", "handle",
+               "slow_factor", "slow_until", "stun_until", "burn_dps", "burn_until")
+
+    def __init__(self, path, capacity=256):
+        self.path = Path(path)
+        self.radius = 15
+        self.count = 0
+        self.pos = np.zeros((capacity, 2))
+        self.speed = np.zeros(capacity)
+        self.base_speed = np.zeros(capacity)
+        self.health = np.zeros(capacity)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.travelled = np.zeros(capacity)  # distance covered along the path
+        self.handle = np.zeros(capacity, dtype=np.int64)
+        self.slow_factor = np.ones(capacity)
+        self.slow_until = np.zeros(capacity, dtype=np.int64)  # ticks
+        self.stun_until = np.zeros(capacity, dtype=np.int64)
+        self.burn_dps = np.zeros(capacity)
+        self.burn_until = np.zeros(capacity, dtype=np.int64)
+        self.registry = Registry(capacity)
+        self.effects = StatusEffects(self)
+        self.order = np.zeros(0, dtype=np.int64)
+        self.progress = np.zeros(0)
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self, needed):
+        capacity = len(self.speed)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in self.columns:
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def add(self, speed=0.5, health=75, color=RED):
+        self._grow(self.count + 1)
+        i = self.count
+        self.pos[i] = self.path.points[0]
+        self.speed[i] = speed
+        self.base_speed[i] = speed
+        self.health[i] = health
+        self.color[i] = color
+        self.travelled[i] = 0
+        self.handle[i] = self.registry.create(i)
+        self.slow_factor[i] = 1.0
+        self.slow_until[i] = 0
+        self.stun_until[i] = 0
+        self.burn_dps[i] = 0.0
+        self.burn_until[i] = 0
+        self.count += 1
+        return i
+
+    def extend(self, spawns):
+        for speed, health, color in spawns:
+            self.add(speed, health, color)
+
+    def clear(self):
+        # old handles may resolve again: effects get cleared below, bullets (Simulation.reset)
+        # and anything else holding handles have to drop theirs themselves
+        self.registry.clear()
+        self.count = 0
+        self.effects.clear()
+        self.order = np.zeros(0, dtype=np.int64)
+        self.progress = np.zeros(0)
+
+    # new level, new path. only makes sense once the table is empty
+    def set_path(self, path):
+        self.path = Path(path)
+
+    def move(self):
+        n = self.count
+        if n == 0:
+            return
+        speed = self.speed[:n]
+        travelled = self.travelled[:n]
+        np.minimum(travelled + speed, self.path.length, out=travelled)
+        self.pos[:n] = self.path.positions(travelled)
+        self.sort()
+
+    # Enemies barely change places between ticks, so last tick's order is almost sorted
+    # already and the stable sort (timsort, it finds the sorted runs) stays close to O(n).
+    # Rows added since then go in at the end.
+    def sort(self):
+        n = self.count
+        order = self.order
+        if len(order) < n:
+            order = np.concatenate((order, np.arange(len(order), n)))
+        order = order[np.argsort(self.travelled[order], kind="stable")]
+        self.order = order
+        self.progress = self.travelled[order]
+
+    def is_alive(self, i):
+        return 0 <= i < self.count and self.health[i] > 0
+
+    # current row of the enemy behind a handle, -1 if it's gone
+    def row_of(self, handle):
+        return self.registry.resolve_one(handle)
+
+    def resolve(self, handles):
+        return self.registry.resolve(handles)
+
+    # Drops dead and finished enemies in one pass and returns (killed, leaked).
+    # Swap-remove: the holes get filled with the surviving rows from the end of the
+    # table, so only as many rows move as got removed. Their handles follow along,
+    # handles of the removed ones stop resolving.
+    def cull(self):
+        n = self.count
+        if len(self.order) < n:
+            self.sort()
+        dead = self.health[:n] <= 0
+        leaked = ~dead & (self.travelled[:n] >= self.path.length)
+        gone = dead | leaked
+        if not gone.any():
+            return 0, 0
+        kept = n - int(gone.sum())
+        holes = np.flatnonzero(gone[:kept])
+        movers = kept + np.flatnonzero(~gone[kept:])
+        self.registry.destroy(self.handle[:n][gone])
+        for name in self.columns:
+            column = getattr(self, name)
+            column[holes] = column[movers]
+        self.registry.move(self.handle[holes], holes)
+        self.count = kept
+
+        # the sorted order keeps its order, it just loses the gone rows and follows the movers
+        remap = np.arange(n)
+        remap[movers] = holes
+        order = self.order[~gone[self.order]]
+        self.order = remap[order]
+        self.progress = self.travelled[self.order]
+        return int(dead.sum()), int(leaked.sum())
@@ -0,0 +1,104 @@
+import heapq
+
+import numpy as np
+
+NEVER = np.iinfo(np.int64).max
+MARGIN = 1.0  # px, wake up a little early rather than a tick late
+
+
+# Decides which towers look for a target on a tick, instead of every tower counting
+# down its reload and scanning for enemies on every tick.
+#
+# Every tower that has to be looked at again sits in a heap under the tick that is due:
+# the tick its reload is done, or for a loaded tower without anything in range
+# (asleep) the earliest tick an enemy could get into range. A tower's range covers a
+# few stretches of the path (Path.coverage) and enemies only ever move forward along it,
+# never faster than their base speed, so the enemy closest behind each stretch says how
+# long it takes at least. New enemies and upgrades wake sleeping towers up early.
+#
+# Towers are looked at on exactly the ticks they could fire on when scanning every tick,
+# so games play out the same, but a tick only costs something for the towers that have
+# something to do. Towers are known by their index in Simulation.towers.
+class FireScheduler:
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.heap = []  # (tick, tower index), entries whose tick isn't wake[index] any more are stale
+        self.wake = np.zeros(0, dtype=np.int64)  # tick each tower is due, NEVER if none
+        self.shot_at = np.zeros(0, dtype=np.int64)  # tick each tower last fired or got placed
+        self.asleep = np.zeros(0, dtype=bool)
+        self.reach = np.zeros(0)  # where the first stretch of path in range of a sleeping tower starts
+
+    def _schedule(self, index, tick):
+        self.wake[index] = tick
+        heapq.heappush(self.heap, (tick, index))
+
+    # a new tower, placed between ticks, loaded fire_rate ticks later
+    def add(self, now, fire_rate):
+        index = len(self.wake)
+        self.wake = np.append(self.wake, NEVER)
+        self.shot_at = np.append(self.shot_at, now)
+        self.asleep = np.append(self.asleep, False)
+        self.reach = np.append(self.reach, np.inf)
+        self._schedule(index, now + fire_rate)
+
+    # indices of the towers to look at on tick now, in tower order
+    def due(self, now):
+        due = []
+        while self.heap and self.heap[0][0] <= now:
+            tick, index = heapq.heappop(self.heap)
+            if self.wake[index] == tick:
+                self.wake[index] = NEVER  # any other entry for the same tick is stale now
+                due.append(index)
+        return sorted(due)
+
+    def fired(self, index, now, fire_rate):
+        self.shot_at[index] = now
+        self.asleep[index] = False
+        self._schedule(index, now + fire_rate)
+
+    # Loaded towers (indices) that found nothing in range on tick now. Each one gets
+    # the tick the enemy closest behind any of its stretches of path could get there.
+    def sleep(self, indices, towers, enemies, now):
+        indices = np.asarray(indices, dtype=np.int64)
+        coverage = [enemies.path.coverage(towers[i].x, towers[i].y, towers[i].range) for i in indices]
+        self.asleep[indices] = True
+        self.reach[indices] = [intervals[0, 0] if len(intervals) else np.inf for intervals in coverage]
+        self.wake[indices] = NEVER
+        gap = np.full(len(indices), np.inf)
+        tower_idx = np.repeat(np.arange(len(indices)), [len(intervals) for intervals in coverage])
+        if enemies.count and len(tower_idx):
+            intervals = np.concatenate(coverage)
+            progress = enemies.progress
+            lo = np.searchsorted(progress, intervals[:, 0], side="left")
+            hi = np.searchsorted(progress, intervals[:, 1], side="right") - 1
+            behind = np.where(lo > 0, intervals[:, 0] - progress[np.maximum(lo - 1, 0)], np.inf)
+            np.minimum.at(gap, tower_idx, np.where(lo <= hi, 0.0, behind))
+            speed = enemies.base_speed[:enemies.count].max()
+            ticks = np.maximum(np.floor((gap - MARGIN) / speed), 1) if speed > 0 else np.full(len(gap), np.inf)
+            for index, n in zip(indices[np.isfinite(ticks)].tolist(), ticks[np.isfinite(ticks)].tolist()):
+                self._schedule(index, now + int(n))
+
+    # Enemies got spawned this tick, none faster than speed. They've made one move at most,
+    # sleeping towers that one of them could reach before their wake tick get woken earlier.
+    def spawned(self, speed, now):
+        sleepers = np.flatnonzero(self.asleep)
+        if len(sleepers) == 0 or speed <= 0:
+            return
+        ticks = np.floor((self.reach[sleepers] - speed - MARGIN) / speed)
+        reachable = np.isfinite(ticks)
+        wake = now + np.maximum(ticks[reachable], 0).astype(np.int64)
+        earlier = wake < self.wake[sleepers[reachable]]
+        for index, tick in zip(sleepers[reachable][earlier].tolist(), wake[earlier].tolist()):
+            self._schedule(index, tick)
+
+    # the tower's range changed, a sleeping one has another look next tick
+    def wake_up(self, index, now):
+        if self.asleep[index]:
+            self._schedule(index, now + 1)
+
+    # Ticks since every tower last fired (Tower.time_since_last_shot), brought up to date
+    def sync(self, towers, now):
+        for tower, shot_at in zip(towers, self.shot_at.tolist()):
+            tower.time_since_last_shot = now - shot_at
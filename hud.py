@@ -0,0 +1,133 @@
+import pygame
+
+from colors import WHITE, BLUE, BLACK, ORANGE, PURPLE, GRAY
+
+
+# One piece of HUD. render(value) draws the widget into a surface (or returns None
+# to hide it), value() gives whatever the widget shows. The surface is cached and
+# only rendered again when value() comes back different. rect is where it sits and
+# what gets clicked, bounds (rect by default) is everything it may draw over.
+class Widget:
+    def __init__(self, name, rect, render, value=None, clickable=False, bounds=None):
+        self.name = name
+        self.rect = pygame.Rect(rect)
+        self.bounds = pygame.Rect(bounds or rect)
+        self.render = render
+        self.value = value
+        self.clickable = clickable
+        self.cached = None
+        self.surface = None
+        self.dirty = True
+
+    def update(self):
+        value = self.value() if self.value else None
+        if self.dirty or value != self.cached:
+            self.cached = value
+            self.surface = self.render(value)
+            self.dirty = False
+            return True
+        return False
+
+
+# Retained mode HUD: a list of widgets drawn back to front with a single blits.
+# The same layout answers hit tests, so clicks go where the widgets are drawn.
+class Hud:
+    def __init__(self):
+        self.widgets = []
+        self.version = 0  # goes up whenever any widget got rendered again
+
+    def add(self, name, rect, render, value=None, clickable=False, bounds=None):
+        widget = Widget(name, rect, render, value, clickable, bounds)
+        self.widgets.append(widget)
+        return widget
+
+    def update(self):
+        changed = False
+        for widget in self.widgets:
+            changed |= widget.update()
+        if changed:
+            self.version += 1
+        return changed
+
+    def draw(self, screen):
+        self.update()
+        screen.blits([(widget.surface, widget.rect) for widget in self.widgets if widget.surface], doreturn=False)
+
+    def rects(self):
+        return [widget.bounds for widget in self.widgets]
+
+    # Name of the clickable widget under pos, the one drawn last wins
+    def hit(self, pos):
+        for widget in reversed(self.widgets):
+            if widget.clickable and widget.rect.collidepoint(pos):
+                return widget.name
+        return None
+
+
+def text(font, color=BLACK, fmt="{}"):
+    return lambda value: font.render(fmt.format(value), True, color)
+
+
+# Toolbar icon plus its price, the button covers the toolbar's whole height
+def tower_button(font, tower_type, rect, price_x):
+    left = rect.left
+
+    def render(price):
+        surface = pygame.Surface((rect.width + 1, rect.height), pygame.SRCALPHA)  # icons include their right edge
+        if tower_type == "normal":
+            pygame.draw.rect(surface, BLUE, (50 - left, 20, 60, 60))
+        elif tower_type == "splash":
+            pygame.draw.circle(surface, ORANGE, (200 - left, 50), 30)
+        else:
+            pygame.draw.polygon(surface, PURPLE, [(300 - left, 20), (270 - left, 80), (330 - left, 80)])
+        surface.blit(font.render(f"${price}", True, BLACK), (price_x - left, 80))
+        return surface
+    return render
+
+
+def filled(size, color):
+    def render(_):
+        surface = pygame.Surface(size)
+        surface.fill(color)
+        return surface
+    return render
+
+
+# The game's HUD: stats top left, "Next Wave" top right and the tower toolbar at the bottom.
+# selected() returns the currently selected tower (or None), speed() the fast forward
+# multiplier, shown under "Next Wave" while it's above 1.
+def game_hud(sim, font, size, selected, speed=None):
+    width, height = size
+    hud = Hud()
+    hud.add("currency", (10, 10, 280, 36), text(font, fmt="Currency: {}"), lambda: sim.currency)
+    hud.add("health", (10, 50, 280, 36), text(font, fmt="Health: {}"), lambda: sim.health)
+    hud.add("wave", (10, 90, 280, 36), text(font, fmt="Wave: {}"), lambda: sim.wave_number)
+
+    hud.add("toolbar", (0, height - 100, width, 100), filled((width, 100), GRAY))
+    for tower_type, left, price_x in (("normal", 50, 60), ("splash", 170, 180), ("slow", 270, 290)):
+        rect = pygame.Rect(left, height - 100, 60, 100)
+        hud.add(tower_type, rect, tower_button(font, tower_type, rect, price_x),
+                lambda tower_type=tower_type: sim.tower_cost[tower_type], clickable=True, bounds=rect.inflate(2, 0))
+
+    # selected tower, right above the toolbar so it clears the tower icons and prices
+    def upgrade_info(info):
+        if info is None:
+            return None
+        return font.render("Upgrade (U): Level {} | Cost: {} | Target (T): {} | Shot (M): {}".format(*info), True, BLACK)
+    hud.add("upgrade", (10, height - 130, width - 10, 30), upgrade_info,
+            lambda: selected() and (selected().level, selected().upgrade_cost, selected().target_priority,
+                                   selected().projectile))
+
+    def next_wave(_):
+        label = font.render("Next Wave", True, WHITE)
+        surface = pygame.Surface((max(100, 10 + label.get_width()), 40), pygame.SRCALPHA)
+        surface.fill(BLUE, (0, 0, 100, 40))
+        surface.blit(label, (10, 5))
+        return surface
+    hud.add("next_wave", (650, 10, 100, 40), next_wave, clickable=True, bounds=(650, 10, 140, 40))
+
+    def speed_info(value):
+        return font.render(f"Speed x{value} (F)", True, BLACK) if value > 1 else None
+    if speed:
+        hud.add("speed", (650, 55, 240, 36), speed_info, speed)
+    return hud
@@ -0,0 +1,104 @@
+import threading
+
+import numpy as np
+
+from map_compile import load_level
+from map_render import MapRenderer
+from placement import PlacementMask
+
+STAGES = 4  # bundle, background pixels, background surface, placement masks
+
+
+# One level ready to play: the compiled map, its baked background and its placement masks
+class Level:
+    def __init__(self, index, bundle, background, placement_mask):
+        self.index = index
+        self.bundle = bundle
+        self.path_points = bundle.path_points
+        self.spawn = bundle.spawn
+        self.end = bundle.end
+        self.background = background
+        self.placement_mask = placement_mask
+
+
+# Loads levels (.tmx maps, compiled into bundles by map_compile.py) on background threads.
+# get(i) hands over level i and starts loading i + 1 right away, so by the time the game
+# moves on the next level is already sitting there and switching is just swapping which
+# Level the front end draws. get() only waits if the loading isn't done yet.
+# progress(i) goes from 0 to 1 while level i loads, for a loading bar.
+#
+# paths and masks index like the level_paths / placement_masks lists of Simulation,
+# so the Simulation can take them as they are.
+class LevelLoader:
+    def __init__(self, maps, size):
+        self.maps = maps
+        self.size = size
+        self.levels = [None] * len(maps)
+        self.stages = [0] * len(maps)
+        self.threads = {}
+        self.errors = {}
+        self.lock = threading.Lock()
+        self.paths = _LevelColumn(self, "path_points")
+        self.masks = _LevelColumn(self, "placement_mask")
+
+    def __len__(self):
+        return len(self.maps)
+
+    def progress(self, index):
+        return self.stages[index % len(self.maps)] / STAGES
+
+    def ready(self, index):
+        return self.levels[index % len(self.maps)] is not None
+
+    # starts loading level index unless it's loaded or loading already
+    def preload(self, index):
+        index %= len(self.maps)
+        with self.lock:
+            if self.levels[index] is not None or index in self.threads:
+                return
+            thread = self.threads[index] = threading.Thread(target=self._load, args=(index,),
+                                                            name=f"level {index}", daemon=True)
+        thread.start()
+
+    def get(self, index):
+        index %= len(self.maps)
+        if self.levels[index] is None:
+            self.preload(index)
+            self.threads[index].join()
+            if index in self.errors:
+                raise self.errors[index]
+        self.preload(index + 1)
+        return self.levels[index]
+
+    def _load(self, index):
+        try:
+            bundle = load_level(self.maps[index])  # compiles the map first if its bundle is stale
+            self.stages[index] = 1
+            # read the memory map in now instead of on the first frame
+            bundle.arrays["background"] = np.array(bundle.arrays["background"])
+            self.stages[index] = 2
+            background = MapRenderer(bundle.background_surface())
+            self.stages[index] = 3
+            mask = PlacementMask(self.size, bundle.path_points, bundle.placement_areas)
+            self.levels[index] = Level(index, bundle, background, mask)
+            self.stages[index] = 4
+        except Exception as error:
+            self.errors[index] = error
+
+
+# One attribute of every level as a sequence, indexing it loads (or waits for) that level.
+# Iterating only goes over the levels that are loaded, Simulation.reset() clears the
+# placement masks that way without pulling in every level.
+class _LevelColumn:
+    def __init__(self, loader, name):
+        self.loader = loader
+        self.name = name
+
+    def __len__(self):
+        return len(self.loader)
+
+    def __getitem__(self, index):
+        return getattr(self.loader.get(index), self.name)
+
+    def __iter__(self):
+        return (getattr(level, self.name) for level in self.loader.levels if level is not None)
@@ -1,33 +1,15 @@
 import pygame, sys
 from pytmx.util_pygame import load_pygame
-
-
-class Tile(pygame.sprite.Sprite):
-    def __init__(self,pos,surf,groups):
-        super().__init__(groups)
-        self.image = surf
-        self.rect = self.image.get_rect(topleft = pos)
+from map_render import MapRenderer
 
 
 pygame.init()
 screen = pygame.display.set_mode((480,320))
 tmx_data = load_pygame(r"C:\Users\FluffyOwl\Desktop\Stuff for games\1 Tiled\Cute_Maps\export\map_test.tmx")
-sprite_group = pygame.sprite.Group()
-
 
-# cycle through all layers
-for layer in tmx_data.visible_layers:
-    if hasattr(layer,"data"): # find all my tiled layers 
-        for x,y,surf in layer.tiles(): # need to be miltiplied by the tiles size ? Me thinks 
-            pos = (x * 16, y * 16)
-            Tile(pos = pos, surf = surf, groups = sprite_group)
 
-
-# objects 
-for obj in tmx_data.objects:
-    pos = obj.x,obj.y
-    if obj.type in ("Tree", "chest"): # use clear names for the objects 
-        Tile(pos = pos, surf = obj.image, groups = sprite_group)
+# all tile layers and the Tree/chest objects get baked into one background surface
+background = MapRenderer.from_tmx(tmx_data)
 
 
 # polyline 
@@ -53,12 +35,12 @@ while True:
 
 
     screen.fill("black")
-    sprite_group.draw(screen)
+    background.draw(screen)
 
 
 
     for obj in tmx_data.objects:
-        pos = obj.x,obj,y
+        pos = obj.x,obj.y
         if obj.type == "area":
             if obj.name == "Spawn_enemy":
                 pygame.draw.circle(screen,"blue",(obj.x,obj.y),5)
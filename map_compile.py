@@ -0,0 +1,140 @@
+import argparse
+import json
+import os
+
+import numpy as np
+import pygame
+
+from map_render import bake_background
+from towers import TOWER_TYPES
+
+# Compiled map bundle: magic, header length, JSON header, then raw arrays.
+# Every array starts on an ALIGN boundary so the loader can memory map it as is.
+MAGIC = b"ZTDMAP1\0"
+ALIGN = 64
+BUNDLE_EXT = ".tdmap"
+
+
+def extract_path(tmx_data):
+    for obj in tmx_data.objects:
+        if obj.name == "enemy_path" and hasattr(obj, "points"):
+            return [((obj.x / 72) + p[0], (obj.y / 72) + p[1]) for p in obj.points]  # so / by 72 works for now but needs to be fixed ^^
+    return []
+
+
+def extract_marker(tmx_data, name):
+    for obj in tmx_data.objects:
+        if getattr(obj, "type", "") == "area" and obj.name.lower() == name.lower():
+            return (obj.x, obj.y)
+    return None
+
+
+# tower_placement_area* polygons, a Tiled "allowed" property ("normal,slow") limits the tower types
+def extract_placement_areas(tmx_data):
+    areas = []
+    for obj in tmx_data.objects:
+        if obj.name and obj.name.startswith("tower_placement_area") and hasattr(obj, "points"):
+            allowed = obj.properties.get("allowed")
+            allowed = [name.strip() for name in allowed.split(",")] if allowed else list(TOWER_TYPES)
+            areas.append({"name": obj.name, "polygon": [(p.x, p.y) for p in obj.points], "allowed": allowed})
+    return areas
+
+
+def write_bundle(out_path, arrays, meta):
+    header = {"meta": meta, "arrays": {}}
+    offset = 0
+    for name, array in arrays.items():
+        offset = -(-offset // ALIGN) * ALIGN
+        header["arrays"][name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset += array.nbytes
+    header_bytes = json.dumps(header).encode()
+    start = -(-(len(MAGIC) + 4 + len(header_bytes)) // ALIGN) * ALIGN
+
+    with open(out_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(len(header_bytes).to_bytes(4, "little"))
+        f.write(header_bytes)
+        for name, array in arrays.items():
+            f.seek(start + header["arrays"][name]["offset"])
+            f.write(np.ascontiguousarray(array).tobytes())
+
+
+def compile_map(tmx_path, out_path=None):
+    from pytmx.util_pygame import load_pygame
+
+    out_path = out_path or os.path.splitext(tmx_path)[0] + BUNDLE_EXT
+    tmx_data = load_pygame(tmx_path)
+    background = bake_background(tmx_data)
+    width, height = background.get_size()
+    pixels = np.frombuffer(pygame.image.tobytes(background, "RGB"), dtype=np.uint8).reshape(height, width, 3)
+
+    areas = extract_placement_areas(tmx_data)
+    arrays = {"background": pixels, "path": np.array(extract_path(tmx_data), dtype=float).reshape(-1, 2)}
+    for i, area in enumerate(areas):
+        arrays[f"area_{i}"] = np.array(area["polygon"], dtype=float)
+    meta = {
+        "source": os.path.basename(tmx_path),
+        "spawn": extract_marker(tmx_data, "spawn_enemy"),
+        "end": extract_marker(tmx_data, "End_enemy"),
+        "areas": [{"name": area["name"], "allowed": area["allowed"]} for area in areas],
+    }
+    write_bundle(out_path, arrays, meta)
+    return out_path
+
+
+# Everything a level needs, straight out of a compiled bundle
+class CompiledMap:
+    def __init__(self, bundle_path):
+        with open(bundle_path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{bundle_path} is not a compiled map")
+            header_len = int.from_bytes(f.read(4), "little")
+            header = json.loads(f.read(header_len))
+        start = -(-(len(MAGIC) + 4 + header_len) // ALIGN) * ALIGN
+
+        self.arrays = {}
+        for name, info in header["arrays"].items():
+            shape = tuple(info["shape"])
+            if 0 in shape:
+                self.arrays[name] = np.zeros(shape, dtype=info["dtype"])
+            else:
+                self.arrays[name] = np.memmap(bundle_path, dtype=info["dtype"], mode="r",
+                                              offset=start + info["offset"], shape=shape)
+
+        meta = header["meta"]
+        self.spawn = meta["spawn"]
+        self.end = meta["end"]
+        self.path_points = [tuple(p) for p in self.arrays["path"].tolist()]
+        self.placement_areas = [{"name": area["name"], "polygon": [tuple(p) for p in self.arrays[f"area_{i}"].tolist()],
+                                 "allowed": area["allowed"]} for i, area in enumerate(meta["areas"])]
+
+    def background_surface(self):
+        pixels = self.arrays["background"]
+        height, width, _ = pixels.shape
+        surface = pygame.image.frombuffer(pixels, (width, height), "RGB")
+        return surface.convert() if pygame.display.get_surface() else surface.copy()
+
+
+# Loads the compiled bundle next to the .tmx, compiling it first if it's missing or older than the map
+def load_level(tmx_path):
+    bundle_path = os.path.splitext(tmx_path)[0] + BUNDLE_EXT
+    if not os.path.exists(bundle_path) or os.path.getmtime(bundle_path) < os.path.getmtime(tmx_path):
+        compile_map(tmx_path, bundle_path)
+    return CompiledMap(bundle_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compiles Tiled .tmx maps into fast loading " + BUNDLE_EXT + " bundles")
+    parser.add_argument("maps", nargs="+", help=".tmx files")
+    args = parser.parse_args()
+
+    # loading tilesets wants a display, a hidden 1x1 one does the job
+    pygame.init()
+    pygame.display.set_mode((1, 1), pygame.HIDDEN)
+    for tmx_path in args.maps:
+        print(f"{tmx_path} -> {compile_map(tmx_path)}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
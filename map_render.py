@@ -0,0 +1,55 @@
+import pygame
+
+TILE_SIZE = 16
+CHUNK_SIZE = 512
+STATIC_OBJECTS = ("Tree", "chest")  # objects that never move and get baked into the background
+
+
+# Composites every visible tile layer plus the static objects into one surface.
+# Done once at load time, afterwards the whole map is a single blit per frame
+# instead of one Tile sprite per 16x16 tile.
+def bake_background(tmx_data, fill="black"):
+    width = tmx_data.width * TILE_SIZE
+    height = tmx_data.height * TILE_SIZE
+    background = pygame.Surface((width, height))
+    background.fill(fill)
+
+    # cycle through all layers
+    for layer in tmx_data.visible_layers:
+        if hasattr(layer, "data"):  # find all my tiled layers
+            background.blits([(surf, (x * TILE_SIZE, y * TILE_SIZE)) for x, y, surf in layer.tiles()], doreturn=False)
+
+    # objects
+    for obj in tmx_data.objects:
+        if obj.type in STATIC_OBJECTS and obj.image:
+            background.blit(obj.image, (obj.x, obj.y))
+
+    if pygame.display.get_surface():
+        background = background.convert()
+    return background
+
+
+# Draws a baked background. Maps bigger than the window get cut into chunks so
+# only the ones on screen get blitted.
+class MapRenderer:
+    def __init__(self, background, chunk_size=CHUNK_SIZE):
+        self.background = background
+        self.chunks = []
+        width, height = background.get_size()
+        for top in range(0, height, chunk_size):
+            for left in range(0, width, chunk_size):
+                rect = pygame.Rect(left, top, chunk_size, chunk_size).clip(background.get_rect())
+                self.chunks.append((background.subsurface(rect), rect))
+
+    @classmethod
+    def from_tmx(cls, tmx_data, **kwargs):
+        return cls(bake_background(tmx_data), **kwargs)
+
+    def draw(self, screen, offset=(0, 0)):
+        view = screen.get_rect()
+        ox, oy = offset
+        if self.background.get_width() <= view.width and self.background.get_height() <= view.height:
+            screen.blit(self.background, (-ox, -oy))
+            return
+        screen.blits([(chunk, rect.move(-ox, -oy)) for chunk, rect in self.chunks
+                      if view.colliderect(rect.move(-ox, -oy))], doreturn=False)
@@ -0,0 +1,104 @@
+import math
+
+import numpy as np
+
+
+# An enemy path measured by arc length. Segment lengths are summed up once per
+# level, after that any distance travelled maps straight to a spot on the path
+# with one searchsorted, for the whole wave at once.
+class Path:
+    def __init__(self, points):
+        self.points = np.array(points, dtype=float).reshape(-1, 2)
+        segments = np.diff(self.points, axis=0)
+        self.lengths = np.hypot(segments[:, 0], segments[:, 1])
+        self.cumulative = np.concatenate(([0.0], np.cumsum(self.lengths)))
+        self.length = self.cumulative[-1]
+        # unit direction of every segment, zero length segments just don't move you
+        safe = np.where(self.lengths > 0, self.lengths, 1.0)
+        self.directions = segments / safe[:, None]
+        self._coverage = {}
+
+    def __len__(self):
+        return len(self.points)
+
+    # index of the segment each distance falls on (same as an enemy's current_point)
+    def segment(self, distance):
+        last = max(len(self.lengths) - 1, 0)
+        return np.clip(np.searchsorted(self.cumulative, distance, side="right") - 1, 0, last)
+
+    def positions(self, distance):
+        if len(self.lengths) == 0:
+            return np.broadcast_to(self.points[:1], (len(distance), 2)).copy()
+        seg = self.segment(distance)
+        along = distance - self.cumulative[seg]
+        return self.points[seg] + self.directions[seg] * along[:, None]
+
+    # The stretches of the path (as (start, end) distances along it) that lie within
+    # radius of (x, y), i.e. where an enemy is in a tower's range. Each segment is cut
+    # with the circle analytically, touching pieces get merged. Cached per circle, a
+    # tower only needs it again after an upgrade.
+    def coverage(self, x, y, radius):
+        key = (x, y, radius)
+        intervals = self._coverage.get(key)
+        if intervals is None:
+            intervals = self._coverage[key] = self._circle_intervals(x, y, radius)
+        return intervals
+
+    def _circle_intervals(self, x, y, radius):
+        if len(self.lengths) == 0:
+            near = np.hypot(*(self.points[0] - (x, y))) <= radius if len(self.points) else False
+            return np.zeros((1, 2)) if near else np.zeros((0, 2))
+        offset = np.array((x, y), dtype=float) - self.points[:-1]
+        along = np.einsum("ij,ij->i", offset, self.directions)
+        across_sq = np.einsum("ij,ij->i", offset, offset) - along ** 2
+        half = np.sqrt(np.maximum(radius * radius - across_sq, 0.0))
+        start = np.maximum(along - half, 0.0)
+        end = np.minimum(along + half, self.lengths)
+        hit = (across_sq <= radius * radius) & (start <= end)
+        start = self.cumulative[:-1][hit] + start[hit]
+        end = self.cumulative[:-1][hit] + end[hit]
+        if len(start) == 0:
+            return np.zeros((0, 2))
+        # merge pieces that run into each other (a circle around a corner)
+        new = np.concatenate(([True], start[1:] > np.maximum.accumulate(end)[:-1]))
+        group = np.cumsum(new) - 1
+        merged_end = np.zeros(group[-1] + 1)
+        np.maximum.at(merged_end, group, end)
+        return np.stack((start[new], merged_end), axis=1)
+
+    # Ticks until a shot fired now from origin at shot_speed (px per tick) gets within reach
+    # of an enemy that has travelled this far and keeps going at speed (px per tick). Goes
+    # over the path from the enemy's segment on and solves
+    # |enemy(t) - origin| = shot_speed * t + reach on each, None if the enemy reaches the
+    # end of the path first.
+    def intercept(self, travelled, speed, origin, shot_speed, reach=0.0):
+        if speed <= 0 or len(self.lengths) == 0:
+            x, y = self.positions(np.array([travelled], dtype=float))[0]
+            return max(math.hypot(x - origin[0], y - origin[1]) - reach, 0.0) / shot_speed
+        ox, oy = origin
+        for k in range(int(self.segment(travelled)), len(self.lengths)):
+            start = max((self.cumulative[k] - travelled) / speed, 0.0)
+            end = (self.cumulative[k + 1] - travelled) / speed
+            if end < start:
+                continue
+            # on this segment the enemy is at (px, py) + (vx, vy) * t, relative to origin
+            vx, vy = self.directions[k] * speed
+            px = self.points[k][0] + self.directions[k][0] * (travelled - self.cumulative[k]) - ox
+            py = self.points[k][1] + self.directions[k][1] * (travelled - self.cumulative[k]) - oy
+            a = vx * vx + vy * vy - shot_speed * shot_speed
+            b = 2.0 * (px * vx + py * vy - shot_speed * reach)
+            c = px * px + py * py - reach * reach
+            if (a * start + b) * start + c <= 0:  # already within reach when it gets onto this segment
+                return start
+            if abs(a) < 1e-12:
+                roots = (-c / b,) if b else ()
+            else:
+                disc = b * b - 4.0 * a * c
+                if disc < 0:
+                    continue
+                root = math.sqrt(disc)
+                roots = sorted(((-b - root) / (2.0 * a), (-b + root) / (2.0 * a)))
+            for t in roots:
+                if start <= t <= end:
+                    return t
+        return None
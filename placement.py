@@ -0,0 +1,78 @@
+import numpy as np
+
+from towers import TOWER_TYPES
+
+PATH_MARGIN = 20  # how close to the path a tower may sit
+FOOTPRINT = 40    # towers are 40x40, centers closer than this on both axes would overlap
+
+
+# Where each tower type may go, as one bool per pixel (indexed [y, x]) per type.
+# Built once per map from the placement polygons and the path corridor, so every
+# placement check, including the live drag preview, is a single array lookup.
+# Placed towers get their footprint stamped out of every type's mask.
+#
+# areas is the map's list of {"polygon": [...], "allowed": [...]} (see map_compile.py),
+# a spot takes the allowed list of the first polygon it's in, same as before.
+# Without areas the whole map is allowed apart from the path.
+class PlacementMask:
+    def __init__(self, size, path, areas=None, tower_types=TOWER_TYPES, margin=PATH_MARGIN, footprint=FOOTPRINT):
+        self.width, self.height = size
+        self.footprint = footprint
+        self.ys, self.xs = np.ogrid[:self.height, :self.width]
+
+        if areas is None:
+            base = {tower_type: np.ones((self.height, self.width), dtype=bool) for tower_type in tower_types}
+        else:
+            base = {tower_type: np.zeros((self.height, self.width), dtype=bool) for tower_type in tower_types}
+            for area in reversed(areas):  # earlier polygons win where they overlap
+                inside = self.polygon(area["polygon"])
+                for tower_type, mask in base.items():
+                    mask[inside] = tower_type in area["allowed"]
+
+        corridor = self.corridor(path, margin)
+        for mask in base.values():
+            mask[corridor] = False
+        self.base = base
+        self.masks = {tower_type: mask.copy() for tower_type, mask in base.items()}
+
+    # Same even-odd ray cast as the old point_in_poly, for every pixel at once
+    def polygon(self, poly):
+        inside = np.zeros((self.height, self.width), dtype=bool)
+        ys, xs = self.ys, self.xs
+        for i in range(len(poly)):
+            x1, y1 = poly[i]
+            x2, y2 = poly[(i + 1) % len(poly)]
+            inside ^= ((y1 > ys) != (y2 > ys)) & (xs < (x2 - x1) * (ys - y1) / ((y2 - y1) + 1e-10) + x1)
+        return inside
+
+    # Every pixel within margin of a path segment
+    def corridor(self, path, margin):
+        corridor = np.zeros((self.height, self.width), dtype=bool)
+        for (x1, y1), (x2, y2) in zip(path[:-1], path[1:]):
+            left = max(int(min(x1, x2) - margin), 0)
+            right = min(int(max(x1, x2) + margin) + 1, self.width)
+            top = max(int(min(y1, y2) - margin), 0)
+            bottom = min(int(max(y1, y2) + margin) + 1, self.height)
+            if left >= right or top >= bottom:
+                continue
+            xs = self.xs[:, left:right] - x1
+            ys = self.ys[top:bottom] - y1
+            dx, dy = x2 - x1, y2 - y1
+            t = np.clip((xs * dx + ys * dy) / max(dx * dx + dy * dy, 1e-10), 0.0, 1.0)
+            corridor[top:bottom, left:right] |= (xs - t * dx) ** 2 + (ys - t * dy) ** 2 <= margin * margin
+        return corridor
+
+    def is_valid(self, x, y, tower_type):
+        x, y = int(x), int(y)
+        return 0 <= x < self.width and 0 <= y < self.height and bool(self.masks[tower_type][y, x])
+
+    def stamp(self, x, y):
+        x, y = int(x), int(y)
+        f = self.footprint
+        for mask in self.masks.values():
+            mask[max(y - f + 1, 0):max(y + f, 0), max(x - f + 1, 0):max(x + f, 0)] = False
+
+    # Back to the empty map, e.g. when the towers got cleared for a new level
+    def clear(self):
+        for tower_type, mask in self.masks.items():
+            mask[:] = self.base[tower_type]
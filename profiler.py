@@ -0,0 +1,84 @@
+import csv
+import time
+
+import numpy as np
+import pygame
+
+from colors import WHITE, BLACK
+
+# Frame phases in the order the game loop runs them. spawn, enemies, towers and
+# bullets get timed inside Simulation.tick, the rest by the front end.
+PHASES = ("events", "spawn", "enemies", "towers", "bullets", "background", "entities", "hud", "flip")
+
+
+# Times every phase of every frame into a fixed size ring buffer (one row per frame,
+# one column per phase). lap(phase) books the time since the previous lap onto that
+# phase, so timing a phase is one perf_counter call and one add, and phases that run
+# more than once per frame (a tick per catch up step) just add up.
+class Profiler:
+    def __init__(self, phases=PHASES, frames=600):
+        self.phases = phases
+        self.columns = {phase: i for i, phase in enumerate(phases)}
+        self.samples = np.zeros((frames, len(phases)))
+        self.frames = 0
+        self.row = self.samples[0]
+        self.last = time.perf_counter()
+
+    def start_frame(self):
+        self.row = self.samples[self.frames % len(self.samples)]
+        self.row[:] = 0.0
+        self.frames += 1
+        self.last = time.perf_counter()
+
+    def lap(self, phase):
+        now = time.perf_counter()
+        self.row[self.columns[phase]] += now - self.last
+        self.last = now
+
+    # The frames still in the buffer, oldest first, in seconds
+    def history(self):
+        size = len(self.samples)
+        if self.frames <= size:
+            return self.samples[:self.frames]
+        return np.roll(self.samples, -(self.frames % size), axis=0)
+
+    # Milliseconds per phase, one row per percentile
+    def percentiles(self, q=(50, 95, 99)):
+        history = self.history()
+        if len(history) == 0:
+            return np.zeros((len(q), len(self.phases)))
+        return np.percentile(history, q, axis=0) * 1000.0
+
+    def dump(self, path):
+        first = max(self.frames - len(self.samples), 0)
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame"] + [f"{phase}_ms" for phase in self.phases] + ["total_ms"])
+            for frame, row in enumerate(self.history() * 1000.0, start=first):
+                writer.writerow([frame] + [f"{ms:.4f}" for ms in row] + [f"{row.sum():.4f}"])
+
+    # p50 / p95 / p99 table of the buffered frames, toggled with F3 in the game.
+    # Every cell gets rendered on its own so the columns line up with any font.
+    def render(self, font):
+        table = self.percentiles()
+        total = self.history().sum(axis=1) * 1000.0
+        rows = [("phase", "p50", "p95", "p99")]
+        rows += [(phase,) + tuple(f"{ms:.2f}" for ms in table[:, i]) for i, phase in enumerate(self.phases)]
+        if len(total):
+            rows.append(("frame",) + tuple(f"{ms:.2f}" for ms in np.percentile(total, (50, 95, 99))))
+
+        cells = [[font.render(cell, True, WHITE) for cell in row] for row in rows]
+        name_width = max(row[0].get_width() for row in cells) + 10
+        number_width = max(cell.get_width() for row in cells for cell in row[1:]) + 10
+        height = font.get_linesize()
+        surface = pygame.Surface((name_width + 3 * number_width + 12, height * len(rows) + 8))
+        surface.fill(BLACK)
+        surface.set_alpha(200)
+        blits = []
+        for i, row in enumerate(cells):
+            y = 4 + i * height
+            blits.append((row[0], (6, y)))
+            for j, cell in enumerate(row[1:], start=1):
+                blits.append((cell, (6 + name_width + j * number_width - cell.get_width(), y)))
+        surface.blits(blits, doreturn=False)
+        return surface
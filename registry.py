@@ -0,0 +1,59 @@
+import numpy as np
+
+SLOT_BITS = 32
+SLOT_MASK = (1 << SLOT_BITS) - 1
+
+
+# Stable handles for rows of a table that moves its rows around (swap-remove).
+# A handle is one int64: the generation in the high bits, a slot in the low bits.
+# The slot remembers which row its entity is in right now, the generation goes up
+# when the entity is destroyed, so a handle to something that's gone simply stops
+# resolving (-1) instead of pointing at whatever took over its row. Everything is
+# O(1) per handle and works on whole arrays of handles at once.
+class Registry:
+    def __init__(self, capacity=256):
+        self.row = np.full(capacity, -1, dtype=np.int64)
+        self.generation = np.zeros(capacity, dtype=np.int64)
+        self.free = list(range(capacity - 1, -1, -1))
+
+    def _grow(self):
+        capacity = len(self.row)
+        self.row = np.concatenate((self.row, np.full(capacity, -1, dtype=np.int64)))
+        self.generation = np.concatenate((self.generation, np.zeros(capacity, dtype=np.int64)))
+        self.free.extend(range(capacity * 2 - 1, capacity - 1, -1))
+
+    # back to how it started, so a game replays with the same handles. Generations start
+    # over too, so a handle handed out before can resolve again to whatever reuses its
+    # slot: whoever holds handles has to drop them when the registry gets cleared.
+    def clear(self):
+        self.row[:] = -1
+        self.generation[:] = 0
+        self.free = list(range(len(self.row) - 1, -1, -1))
+
+    def create(self, row):
+        if not self.free:
+            self._grow()
+        slot = self.free.pop()
+        self.row[slot] = row
+        return (int(self.generation[slot]) << SLOT_BITS) | slot
+
+    def destroy(self, handles):
+        slots = np.asarray(handles, dtype=np.int64) & SLOT_MASK
+        self.row[slots] = -1
+        self.generation[slots] += 1
+        self.free.extend(slots.tolist())
+
+    # the entities behind handles now live in rows
+    def move(self, handles, rows):
+        self.row[np.asarray(handles, dtype=np.int64) & SLOT_MASK] = rows
+
+    # rows of the handles, -1 for the ones that are gone
+    def resolve(self, handles):
+        handles = np.asarray(handles, dtype=np.int64)
+        slots = handles & SLOT_MASK
+        alive = self.generation[slots] == handles >> SLOT_BITS
+        return np.where(alive, self.row[slots], -1)
+
+    def resolve_one(self, handle):
+        slot = handle & SLOT_MASK
+        return int(self.row[slot]) if self.generation[slot] == handle >> SLOT_BITS else -1
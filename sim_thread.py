@@ -0,0 +1,146 @@
+import queue
+import threading
+import time
+
+import numpy as np
+
+from simulation import TICK, MAX_TICKS_PER_FRAME
+
+
+# Everything a frame needs to draw one tick of the game, copied out of the
+# Simulation so the render thread never reads arrays the sim thread is writing.
+# Towers are shared (only their stats change, and only through commands).
+class Snapshot:
+    def __init__(self, sim, published):
+        enemies, bullets = sim.enemies, sim.bullets
+        n = enemies.count
+        slots = bullets.slots()
+        self.published = published  # perf_counter() time it went out
+        self.tick = sim.ticks
+        self.enemy_handle = enemies.handle[:n].copy()
+        self.enemy_pos = enemies.pos[:n].copy()
+        self.enemy_color = enemies.color[:n].copy()
+        self.enemy_radius = enemies.radius
+        self.bullet_slot = slots
+        self.bullet_origin = bullets.origin_pos[slots]
+        self.bullet_pos = bullets.pos[slots]
+        self.bullet_color = bullets.color[slots]
+        self.bullet_radius = bullets.radius
+        self.shot_pos, self.shot_color = bullets.shots()  # hitscan / timed, not interpolated
+        self.towers = tuple(sim.towers)
+        self.path = sim.path
+        self.tower_cost = sim.tower_cost
+        self.currency = sim.currency
+        self.health = sim.health
+        self.wave_number = sim.wave_number
+        self.game_over = sim.game_over
+
+
+# pos of the things in curr that were in prev too, moved alpha of the way from prev to curr
+def _blend(prev_keys, prev_pos, keys, pos, alpha):
+    pos = pos.copy()
+    if len(prev_keys) == 0 or len(keys) == 0:
+        return pos
+    order = np.argsort(prev_keys)
+    idx = np.minimum(np.searchsorted(prev_keys[order], keys), len(order) - 1)
+    matched = prev_keys[order][idx] == keys
+    before = prev_pos[order][idx][matched]
+    pos[matched] = before + (pos[matched] - before) * alpha
+    return pos
+
+
+# Enemy and bullet positions alpha (0..1) of the way from snapshot prev to curr.
+# Enemies are matched up by handle, bullets by slot (and where they were fired from,
+# so a slot that got reused in between doesn't slide across the map).
+def interpolate(prev, curr, alpha):
+    if prev is None:
+        return curr.enemy_pos, curr.bullet_pos
+    enemy_pos = _blend(prev.enemy_handle, prev.enemy_pos, curr.enemy_handle, curr.enemy_pos, alpha)
+    bullet_pos = curr.bullet_pos.copy()
+    if len(prev.bullet_slot) and len(curr.bullet_slot):
+        same = np.isin(curr.bullet_slot, prev.bullet_slot)
+        before = np.searchsorted(prev.bullet_slot, curr.bullet_slot[same])  # slots() comes out sorted
+        same[same] = (prev.bullet_origin[before] == curr.bullet_origin[same]).all(axis=1)
+        bullet_pos = _blend(prev.bullet_slot, prev.bullet_pos, np.where(same, curr.bullet_slot, -1),
+                            curr.bullet_pos, alpha)
+    return enemy_pos, bullet_pos
+
+
+# Runs a Simulation on its own thread at TICK_RATE, however long frames take.
+# Player actions go in through submit() and get applied between ticks, after every
+# tick a new Snapshot gets published. The front end draws between the last two
+# (frame()), so what's on screen lags one tick behind but moves smoothly.
+# Publishing is a single attribute swap, no locks. speed (see SPEEDS) runs that many
+# ticks in the time of one.
+class SimThread:
+    def __init__(self, sim):
+        self.sim = sim
+        self.paused = False
+        self.speed = 1
+        self.commands = queue.SimpleQueue()
+        self.snapshots = (None, Snapshot(sim, time.perf_counter()))
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopping.set()
+        self.thread.join()
+
+    # fn(*args) runs on the sim thread before the next tick
+    def submit(self, fn, *args):
+        self.commands.put((fn, args))
+
+    @property
+    def latest(self):
+        return self.snapshots[1]
+
+    # the HUD binds to these like it would to the Simulation
+    @property
+    def currency(self):
+        return self.latest.currency
+
+    @property
+    def health(self):
+        return self.latest.health
+
+    @property
+    def wave_number(self):
+        return self.latest.wave_number
+
+    @property
+    def tower_cost(self):
+        return self.latest.tower_cost
+
+    # (prev, curr, alpha) to draw right now
+    def frame(self):
+        prev, curr = self.snapshots
+        alpha = min(max((time.perf_counter() - curr.published) * self.speed / TICK, 0.0), 1.0)
+        return prev, curr, alpha
+
+    def _run(self):
+        next_tick = time.perf_counter()
+        while not self.stopping.is_set():
+            now = time.perf_counter()
+            if now < next_tick:
+                self.stopping.wait(next_tick - now)
+                continue
+            if now - next_tick > MAX_TICKS_PER_FRAME * TICK:
+                next_tick = now  # way behind, drop the backlog instead of spiralling
+            while now >= next_tick and not self.stopping.is_set():
+                restarted = False
+                while True:
+                    try:
+                        fn, args = self.commands.get_nowait()
+                    except queue.Empty:
+                        break
+                    fn(*args)
+                    restarted |= fn == self.sim.reset
+                if not self.paused and not self.sim.game_over:
+                    self.sim.tick()
+                # after a reset the old snapshot's handles may resolve to the new enemies, nothing to blend from
+                prev = None if restarted else self.snapshots[1]
+                self.snapshots = (prev, Snapshot(self.sim, time.perf_counter()))
+                next_tick += TICK / self.speed
@@ -0,0 +1,266 @@
+import hashlib
+import random
+
+import numpy as np
+
+from colors import RED, GREEN, BLUE
+from enemies import EnemyTable
+from fire_scheduler import FireScheduler
+from bullets import BulletPool
+from spatial_grid import SpatialGrid
+from targeting import pick_targets
+from towers import TOWER_TYPES
+from waves import WaveSchedule
+
+# Path for enemies
+path_points = [(100, 100), (300, 100), (300, 300), (500, 300), (700, 500)]
+
+tower_cost = {"normal": 20, "splash": 50, "slow": 15}  # Tower costs
+
+# The simulation always advances in whole ticks of this length, whatever the frame rate
+TICK_RATE = 60
+TICK = 1.0 / TICK_RATE
+MAX_TICKS_PER_FRAME = 5
+SPEEDS = (1, 2, 4, 16)  # fast forward multipliers the front ends cycle through
+
+
+# Turns the game time piled up since the last frame into whole ticks.
+# Returns (ticks to run, time left over for the next frame). A really long frame
+# only catches up MAX_TICKS_PER_FRAME ticks and drops the rest instead of spiralling.
+# At speed x the front end adds x times the real frame time and up to x times as
+# many ticks run per frame. It's the same ticks either way, just more of them per
+# frame, so fast forward never changes how a game plays out.
+def ticks_due(accumulator, speed=1):
+    ticks = int(accumulator / TICK)
+    if ticks > MAX_TICKS_PER_FRAME * speed:
+        return MAX_TICKS_PER_FRAME * speed, 0.0
+    return ticks, accumulator - ticks * TICK
+
+
+# A whole wave in one go, handy for headless tests and benchmarks.
+# The game itself spawns through its WaveSchedule (see waves.py).
+def spawn_wave(wave_number, rng=random):
+    spawns = []
+    for _ in range(wave_number * 2):
+        speed = rng.uniform(0.3, 1.0)
+        health = rng.randint(40, 80)
+        color = rng.choice([RED, GREEN, BLUE])
+        spawns.append((speed, health, color))
+    return spawns
+
+
+# The whole game state and rules without any pygame in it.
+# A front end feeds it player actions (place / upgrade / start wave), calls step()
+# and draws whatever is in enemies, towers and bullets. Runs fine without a display.
+#
+# level_paths holds one enemy path per level, by default the paths in the wave file or
+# path_points. With waves_per_level set the game moves on to the next level once that
+# many waves are cleared (TD_test does this), without it the first level just keeps going.
+# Waves come from waves (a WaveSchedule, waves.json by default) and stream in over the
+# ticks after start_wave() instead of all at once. placement_masks holds a PlacementMask per level
+# (see placement.py), placement(x, y, tower_type) can replace the check altogether,
+# with neither of them it's the default "not on the path" check.
+#
+# All randomness comes from the game's own RNG seeded with seed (a random one gets
+# picked and kept in self.seed if none is given), so the same seed and the same
+# actions on the same ticks always end in the same state, see checksum().
+#
+# Set profiler to a Profiler (see profiler.py) to get tick() timed per phase.
+class Simulation:
+    def __init__(self, level_paths=None, tower_cost=tower_cost, currency=100, health=10,
+                 waves_per_level=None, placement=None, placement_masks=None, seed=None, waves=None):
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+        self.waves = waves or WaveSchedule.load()
+        if level_paths is None:
+            level_paths = self.waves.paths() or [path_points]
+        self.level_paths = level_paths
+        self.tower_cost = tower_cost
+        self.start_currency = currency
+        self.start_health = health
+        self.waves_per_level = waves_per_level
+        self.placement = placement
+        self.placement_masks = placement_masks
+        self.enemies = EnemyTable(level_paths[0])
+        self.grid = SpatialGrid()
+        self.bullets = BulletPool()
+        self.towers = []
+        self.scheduler = FireScheduler()  # which towers look for a target on which tick, see fire_scheduler.py
+        self.profiler = None
+        self.reset()
+
+    def reset(self):
+        self.rng = random.Random(self.seed)
+        self.currency = self.start_currency
+        self.health = self.start_health
+        self.wave_number = 1
+        self.current_level = 0
+        self.wave_started = False
+        self.spawning = None  # spawn stream of the running wave, None once it's all out
+        self.next_spawn = None
+        self.wave_tick = 0
+        self.game_over = False
+        self.ticks = 0
+        self.enemies.clear()
+        self.enemies.set_path(self.path)
+        self.bullets.clear()
+        self.towers = []
+        self.scheduler.clear()
+        if self.placement_masks:
+            for mask in self.placement_masks:
+                mask.clear()
+
+    @property
+    def path(self):
+        return self.level_paths[self.current_level]
+
+    @property
+    def placement_mask(self):
+        return self.placement_masks[self.current_level] if self.placement_masks else None
+
+    # Check if a point is on the enemy path
+    def is_on_path(self, x, y):
+        for i in range(len(self.path) - 1):
+            x1, y1 = self.path[i]
+            x2, y2 = self.path[i + 1]
+            # Check if the point is close to the line segment
+            if min(x1, x2) - 20 <= x <= max(x1, x2) + 20 and min(y1, y2) - 20 <= y <= max(y1, y2) + 20:
+                return True
+        return False
+
+    def can_afford(self, tower_type):
+        return self.currency >= self.tower_cost[tower_type]
+
+    def is_valid_placement(self, x, y, tower_type):
+        if self.placement_mask:
+            return self.placement_mask.is_valid(x, y, tower_type)
+        if self.placement:
+            return self.placement(x, y, tower_type)
+        return not self.is_on_path(x, y)
+
+    def place_tower(self, tower_type, x, y):
+        if not self.can_afford(tower_type) or not self.is_valid_placement(x, y, tower_type):
+            return None
+        tower = TOWER_TYPES[tower_type](x, y)
+        self.towers.append(tower)
+        self.scheduler.add(self.ticks, tower.fire_rate)
+        if self.placement_mask:
+            self.placement_mask.stamp(x, y)
+        self.currency -= self.tower_cost[tower_type]
+        return tower
+
+    def upgrade_tower(self, tower):
+        tower.upgrade(self)
+        if tower in self.towers:  # a longer range might reach enemies already
+            self.scheduler.wake_up(self.towers.index(tower), self.ticks)
+
+    def start_wave(self):
+        if not self.wave_started:
+            self.wave_started = True
+
+    # a wave is still going while it's queued, spawning or has enemies left
+    @property
+    def wave_active(self):
+        return self.wave_started or self.spawning is not None or bool(self.enemies)
+
+    # Adds every enemy whose spawn tick came up
+    def spawn_due(self):
+        while self.next_spawn is not None and self.next_spawn[0] <= self.wave_tick:
+            self.enemies.add(*self.next_spawn[1])
+            self.next_spawn = next(self.spawning, None)
+        if self.next_spawn is None:
+            self.spawning = None
+        self.wave_tick += 1
+
+    def next_level(self):
+        self.current_level = (self.current_level + 1) % len(self.level_paths)
+        self.wave_number = 1
+        self.towers = []  # Reset towers for the new level
+        self.scheduler.clear()
+        if self.placement_mask:
+            self.placement_mask.clear()
+        self.currency += 100  # Bonus currency for completing a level
+        self.enemies.set_path(self.path)
+
+    def step(self, n_ticks=1):
+        for _ in range(n_ticks):
+            if self.game_over:
+                break
+            self.tick()
+
+    def tick(self):
+        enemies, bullets, grid = self.enemies, self.bullets, self.grid
+        profiler = self.profiler
+        self.ticks += 1
+        enemies.effects.advance(self.ticks)
+
+        if self.wave_started and not enemies and self.spawning is None:
+            self.spawning = self.waves.spawns(self.current_level, self.wave_number, self.rng)
+            self.next_spawn = next(self.spawning, None)
+            self.wave_tick = 0
+            self.wave_number += 1
+            self.wave_started = False
+        spawned = 0.0  # fastest enemy spawned this tick
+        if self.spawning is not None:
+            before = enemies.count
+            self.spawn_due()
+            if enemies.count > before:
+                spawned = enemies.base_speed[before:enemies.count].max()
+
+        # Check if we should advance to the next level, once the last wave is cleared
+        if self.waves_per_level and self.wave_number > self.waves_per_level and not enemies and self.spawning is None:
+            self.next_level()
+        if profiler:
+            profiler.lap("spawn")
+
+        enemies.move()
+        killed, leaked = enemies.cull()
+        self.currency += 10 * killed
+        self.health -= leaked
+        # towers and splash look enemies up through the grid, cells as big as the longest range
+        grid.rebuild(enemies.pos[:enemies.count], max((tower.range for tower in self.towers), default=100))
+
+        if self.health <= 0:
+            self.game_over = True
+        if profiler:
+            profiler.lap("enemies")
+
+        scheduler, towers = self.scheduler, self.towers
+        if spawned:
+            scheduler.spawned(spawned, self.ticks)
+        due = scheduler.due(self.ticks)
+        # one targeting pass for every tower that can fire this tick, the rest sleep until an enemy can get in range
+        idle = []
+        for i, target in zip(due, pick_targets([towers[i] for i in due], enemies, grid)):
+            if target >= 0:
+                towers[i].shoot(enemies, target, bullets)
+                scheduler.fired(i, self.ticks, towers[i].fire_rate)
+            else:
+                idle.append(i)
+        if idle:
+            scheduler.sleep(idle, towers, enemies, self.ticks)
+        if profiler:
+            profiler.lap("towers")
+
+        bullets.update(enemies, grid)
+        if profiler:
+            profiler.lap("bullets")
+
+    # Fingerprint of the whole game state, equal runs give equal checksums
+    def checksum(self):
+        digest = hashlib.sha1()
+        digest.update(repr((self.ticks, self.currency, self.health, self.wave_number, self.current_level,
+                            self.wave_started, self.wave_tick, self.next_spawn, self.game_over)).encode())
+        n = self.enemies.count
+        for name in self.enemies.columns:
+            digest.update(np.ascontiguousarray(getattr(self.enemies, name)[:n]).tobytes())
+        slots = self.bullets.slots()
+        for name in self.bullets.columns:
+            digest.update(np.ascontiguousarray(getattr(self.bullets, name)[slots]).tobytes())
+        digest.update(repr(self.bullets.scheduled).encode())
+        self.scheduler.sync(self.towers, self.ticks)
+        for tower in self.towers:
+            digest.update(repr((tower.tower_type, tower.x, tower.y, tower.level, tower.range, tower.damage,
+                                tower.time_since_last_shot, tower.target_priority, tower.projectile)).encode())
+        return digest.hexdigest()
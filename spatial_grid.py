@@ -0,0 +1,77 @@
+import numpy as np
+
+# cell coordinates get shifted by this before being packed into one int key,
+# way bigger than any map we'll ever have
+CELL_OFFSET = 1 << 20
+CELL_STRIDE = 1 << 21
+
+
+# Uniform grid over enemy positions, rebuilt once per frame after the enemies move.
+# Points are bucketed by cell and sorted by cell key, so a range query only
+# looks at the handful of cells overlapping the circle instead of every enemy.
+class SpatialGrid:
+    def __init__(self, cell_size=100):
+        self.cell_size = float(cell_size)
+        self.pos = np.zeros((0, 2))
+        self.order = np.zeros(0, dtype=np.int64)  # point indices sorted by cell
+        self.keys = np.zeros(0, dtype=np.int64)  # occupied cells, sorted
+        self.starts = np.zeros(0, dtype=np.int64)
+        self.ends = np.zeros(0, dtype=np.int64)
+
+    def _cell(self, xy):
+        return np.floor(np.asarray(xy, dtype=float) / self.cell_size).astype(np.int64) + CELL_OFFSET
+
+    def rebuild(self, pos, cell_size=None):
+        if cell_size:
+            self.cell_size = float(cell_size)
+        self.pos = pos
+        cells = self._cell(pos)
+        keys = cells[:, 0] * CELL_STRIDE + cells[:, 1]
+        self.order = np.argsort(keys, kind="stable")
+        self.keys, self.starts, counts = np.unique(keys[self.order], return_index=True, return_counts=True)
+        self.ends = self.starts + counts
+
+    # All (center, point) pairs with the point inside the center's radius.
+    # Returns (center index, point index, squared distance) arrays.
+    def query_pairs(self, centers, radii):
+        centers = np.asarray(centers, dtype=float).reshape(-1, 2)
+        radii = np.broadcast_to(np.asarray(radii, dtype=float), len(centers))
+        empty = np.zeros(0, dtype=np.int64)
+        if len(centers) == 0 or len(self.keys) == 0:
+            return empty, empty, np.zeros(0)
+
+        low = self._cell(centers - radii[:, None])
+        high = self._cell(centers + radii[:, None])
+        span = int((high - low).max()) + 1
+        # every center looks at the same span x span block of cells, the ones outside
+        # its own bounding box get masked away
+        dx, dy = np.meshgrid(np.arange(span), np.arange(span), indexing="ij")
+        cx = low[:, 0, None] + dx.ravel()
+        cy = low[:, 1, None] + dy.ravel()
+        inside = (cx <= high[:, 0, None]) & (cy <= high[:, 1, None])
+        center_of_cell = np.broadcast_to(np.arange(len(centers))[:, None], cx.shape)[inside]
+        cell_keys = (cx * CELL_STRIDE + cy)[inside]
+
+        slot = np.searchsorted(self.keys, cell_keys)
+        slot = np.minimum(slot, len(self.keys) - 1)
+        found = self.keys[slot] == cell_keys
+        center_of_cell = center_of_cell[found]
+        starts = self.starts[slot[found]]
+        counts = self.ends[slot[found]] - starts
+
+        # expand every (center, cell) hit into its points
+        total = int(counts.sum())
+        if total == 0:
+            return empty, empty, np.zeros(0)
+        center_idx = np.repeat(center_of_cell, counts)
+        first = np.repeat(np.cumsum(counts) - counts, counts)
+        point_idx = self.order[np.repeat(starts, counts) + np.arange(total) - first]
+
+        offset = self.pos[point_idx] - centers[center_idx]
+        dist_sq = np.einsum("ij,ij->i", offset, offset)
+        hit = dist_sq <= radii[center_idx] ** 2
+        return center_idx[hit], point_idx[hit], dist_sq[hit]
+
+    def query(self, x, y, radius):
+        _, point_idx, _ = self.query_pairs((x, y), radius)
+        return point_idx
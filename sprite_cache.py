@@ -0,0 +1,79 @@
+import numpy as np
+import pygame
+
+from colors import GREEN, YELLOW
+
+COLORKEY = (255, 0, 255)  # never used by the game itself
+
+
+def _surface(size):
+    surface = pygame.Surface(size)
+    surface.fill(COLORKEY)
+    surface.set_colorkey(COLORKEY, pygame.RLEACCEL)
+    if pygame.display.get_surface():
+        surface = surface.convert()
+    return surface
+
+
+# Pre-rasterized towers, range rings, enemies and bullets. Every look gets drawn with
+# pygame.draw once, after that a frame is just a list of (sprite, topleft) pairs that
+# goes to the screen in one blits call. Sprites come out pixel for pixel the same as
+# drawing the primitives straight onto the screen.
+class SpriteCache:
+    def __init__(self):
+        self.sprites = {}
+
+    # Tower body plus its range ring, keyed by (type, level, color, selected).
+    # Returns the sprite and where its top left sits relative to the tower.
+    def tower(self, tower, selected=False):
+        key = (tower.tower_type, tower.level, tuple(tower.color), selected)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            r = max(tower.range, 20)
+            surface = _surface((2 * r + 1, 2 * r + 1))
+            color = YELLOW if selected else tower.color
+            if tower.shape == "square":
+                pygame.draw.rect(surface, color, (r - 20, r - 20, 40, 40))
+            elif tower.shape == "circle":
+                pygame.draw.circle(surface, color, (r, r), 20)
+            else:
+                pygame.draw.polygon(surface, color, [(r, r - 20), (r - 20, r + 20), (r + 20, r + 20)])
+            pygame.draw.circle(surface, GREEN, (r, r), tower.range, 1)
+            sprite = self.sprites[key] = (surface, (-r, -r))
+        return sprite
+
+    def circle(self, kind, color, radius):
+        key = (kind, radius, tuple(color))
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            surface = _surface((2 * radius + 1, 2 * radius + 1))
+            pygame.draw.circle(surface, color, (radius, radius), radius)
+            sprite = self.sprites[key] = (surface, (-radius, -radius))
+        return sprite
+
+    def towers(self, towers, selected=None):
+        blits = []
+        for tower in towers:
+            surface, (dx, dy) = self.tower(tower, tower is selected)
+            blits.append((surface, (tower.x + dx, tower.y + dy)))
+        return blits
+
+    # One circle sprite per distinct color, positions straight from the numpy columns
+    def circles(self, kind, pos, colors, radius):
+        if len(pos) == 0:
+            return []
+        unique, inverse = np.unique(colors, axis=0, return_inverse=True)
+        sprites = [self.circle(kind, color.tolist(), radius)[0] for color in unique]
+        topleft = (pos.astype(int) - radius).tolist()
+        return [(sprites[i], xy) for i, xy in zip(inverse.ravel().tolist(), topleft)]
+
+    def enemies(self, enemies):
+        n = enemies.count
+        return self.circles("enemy", enemies.pos[:n], enemies.color[:n], enemies.radius)
+
+    # pooled bullets plus the hitscan / timed shots (see BulletPool.shots)
+    def bullets(self, bullets):
+        slots = bullets.slots()
+        shot_pos, shot_color = bullets.shots()
+        return (self.circles("bullet", bullets.pos[slots], bullets.color[slots], bullets.radius)
+                + self.circles("bullet", shot_pos, shot_color, bullets.radius))
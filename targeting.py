@@ -0,0 +1,78 @@
+import numpy as np
+
+# Target priorities a tower can pick from (cycled with T on the selected tower)
+PRIORITIES = ("first", "last", "strongest", "closest")
+
+
+# Picks a target for every tower that is ready to fire in one go.
+# "first" and "last" towers look their path coverage up in the enemies' progress
+# order (see by_progress), the others go through the spatial grid: it hands back
+# only the (tower, enemy) pairs that are actually in range, the tower's priority
+# decides the score of its pairs and the best pair per tower wins.
+# Returns one enemy row per tower, -1 where nothing is in range.
+def pick_targets(towers, enemies, grid):
+    targets = np.full(len(towers), -1, dtype=np.int64)
+    if enemies.count == 0 or not towers:
+        return targets
+
+    priority = np.array([PRIORITIES.index(tower.target_priority) for tower in towers])
+    progress = priority <= 1
+    if progress.any():
+        chosen = np.flatnonzero(progress)
+        targets[chosen] = by_progress([towers[i] for i in chosen], priority[chosen] == 1, enemies)
+    if progress.all():
+        return targets
+
+    chosen = np.flatnonzero(~progress)
+    tower_pos = np.array([(towers[i].x, towers[i].y) for i in chosen], dtype=float)
+    tower_range = np.array([towers[i].range for i in chosen], dtype=float)
+    tower_idx, enemy_idx, dist_sq = grid.query_pairs(tower_pos, tower_range)
+    if len(tower_idx) == 0:
+        return targets
+
+    keys = np.stack((enemies.health[enemy_idx], -dist_sq))  # strongest, closest
+    score = keys[priority[chosen][tower_idx] - 2, np.arange(len(tower_idx))]
+
+    # sorted by tower, then best score, then lowest row so ties always go the same way
+    order = np.lexsort((enemy_idx, -score, tower_idx))
+    winners, first = np.unique(tower_idx[order], return_index=True)
+    targets[chosen[winners]] = enemy_idx[order[first]]
+    return targets
+
+
+# Furthest along ("first") or least far ("last") enemy in range of every tower.
+# A tower's range covers a few stretches of the path (Path.coverage), the enemies in
+# such a stretch are a slice of the progress sorted order, so its best enemy is one
+# searchsorted away at either end of the slice. No per enemy work at all.
+def by_progress(towers, last, enemies):
+    targets = np.full(len(towers), -1, dtype=np.int64)
+    coverage = [enemies.path.coverage(tower.x, tower.y, tower.range) for tower in towers]
+    tower_idx = np.repeat(np.arange(len(towers)), [len(intervals) for intervals in coverage])
+    if len(tower_idx) == 0:
+        return targets
+    intervals = np.concatenate(coverage)
+    progress, order = enemies.progress, enemies.order
+
+    lo = np.searchsorted(progress, intervals[:, 0], side="left")  # first enemy past the start
+    hi = np.searchsorted(progress, intervals[:, 1], side="right") - 1  # last one before the end
+    found = lo <= hi
+    last = last[tower_idx]
+    pick = np.where(last, lo, hi)[found]
+    tower_idx, last = tower_idx[found], last[found]
+    if len(pick) == 0:
+        return targets
+
+    # best stretch per tower, the stretches of one tower never overlap
+    score = np.where(last, -progress[pick], progress[pick])
+    best = np.lexsort((-score, tower_idx))
+    winners, first = np.unique(tower_idx[best], return_index=True)
+    pick = pick[best[first]]
+    targets[winners] = order[pick]
+
+    # ties go to the lowest row, same as the grid path
+    value = progress[pick]
+    tie_lo = np.searchsorted(progress, value, side="left")
+    tie_hi = np.searchsorted(progress, value, side="right")
+    for i in np.flatnonzero(tie_hi - tie_lo > 1):
+        targets[winners[i]] = order[tie_lo[i]:tie_hi[i]].min()
+    return targets
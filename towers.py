@@ -0,0 +1,102 @@
+from colors import BLUE, ORANGE, PURPLE
+
+
+# Towers only hold their stats and fire into the BulletPool,
+# drawing them is up to the front end. projectile is how their shots
+# travel, one of bullets.PROJECTILES. When they get to fire is up to the
+# Simulation's FireScheduler (fire_rate ticks after the last shot at the earliest).
+
+# Normal Tower
+class NormalTower:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.tower_type = "normal"
+        self.range = 100
+        self.fire_rate = 60
+        self.damage = 12
+        self.time_since_last_shot = 0
+        self.target_priority = "first"
+        self.projectile = "bullet"
+        self.level = 1
+        self.upgrade_cost = 15
+        self.color = BLUE
+        self.shape = "square"
+
+    def shoot(self, enemies, i, bullets):
+        self.time_since_last_shot = 0
+        bullets.fire(self.projectile, self.x, self.y, enemies, i, self.damage, self.range, self.color)
+
+    def upgrade(self, game):
+        if game.currency >= self.upgrade_cost:
+            game.currency -= self.upgrade_cost
+            self.level += 1
+            self.range += 35
+            self.damage += 18
+            self.upgrade_cost += 20
+
+# Splash Tower
+class SplashTower:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.tower_type = "splash"
+        self.range = 95
+        self.fire_rate = 50
+        self.damage = 13
+        self.time_since_last_shot = 0
+        self.target_priority = "first"
+        self.projectile = "bullet"
+        self.level = 1
+        self.upgrade_cost = 30
+        self.color = ORANGE
+        self.shape = "circle"
+        self.splash_radius = 12
+
+    def shoot(self, enemies, i, bullets):
+        self.time_since_last_shot = 0
+        bullets.fire(self.projectile, self.x, self.y, enemies, i, self.damage, self.range, self.color,
+                     splash_radius=self.splash_radius)
+
+    def upgrade(self, game):
+        if game.currency >= self.upgrade_cost:
+            game.currency -= self.upgrade_cost
+            self.level += 1
+            self.range += 9
+            self.damage += 7
+            self.upgrade_cost += 20
+
+# Slow Tower
+class SlowTower:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.tower_type = "slow"
+        self.range = 150
+        self.fire_rate = 37
+        self.damage = 7
+        self.time_since_last_shot = 0
+        self.target_priority = "first"
+        self.projectile = "bullet"
+        self.level = 1
+        self.upgrade_cost = 25
+        self.color = PURPLE
+        self.shape = "triangle"
+        self.slow_duration = 3600  # Ticks
+        self.slow_amount = 0.65  # Speed multiplier, slows don't stack (see effects.py)
+
+    def shoot(self, enemies, i, bullets):
+        self.time_since_last_shot = 0
+        enemies.effects.slow(i, self.slow_amount, self.slow_duration)
+        bullets.fire(self.projectile, self.x, self.y, enemies, i, self.damage, self.range, self.color)
+
+    def upgrade(self, game):
+        if game.currency >= self.upgrade_cost:
+            game.currency -= self.upgrade_cost
+            self.level += 1
+            self.range += 18
+            self.damage += 5
+            self.upgrade_cost += 20
+
+
+TOWER_TYPES = {"normal": NormalTower, "splash": SplashTower, "slow": SlowTower}
@@ -0,0 +1,55 @@
+import heapq
+import json
+import os
+
+import colors
+
+WAVES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "waves.json")
+
+
+# Wave definitions loaded from a JSON file (waves.json by default):
+#
+#   "archetypes": {"grunt": {"speed": [min, max], "health": [min, max], "colors": ["RED", ...]}, ...}
+#   "levels": [{"path": [[x, y], ...],        optional, the enemy path of that level
+#               "waves": [[group, ...], ...],  hand made waves 1, 2, ...
+#               "endless": [group, ...]}]      every wave after those
+#
+# A group is {"archetype": "grunt", "count": 5, "per_wave": 2, "interval": 20, "delay": 0},
+# count + per_wave * wave_number enemies, one every interval ticks, starting delay ticks
+# into the wave. All fields but archetype are optional.
+class WaveSchedule:
+    def __init__(self, data):
+        self.archetypes = {}
+        for name, archetype in data["archetypes"].items():
+            self.archetypes[name] = dict(archetype, colors=[getattr(colors, color) for color in archetype["colors"]])
+        self.levels = data["levels"]
+
+    @classmethod
+    def load(cls, path=WAVES_FILE):
+        with open(path) as f:
+            return cls(json.load(f))
+
+    # enemy paths of the levels that have one, in level order
+    def paths(self):
+        return [[tuple(point) for point in level["path"]] for level in self.levels if "path" in level]
+
+    def groups(self, level, wave_number):
+        level = self.levels[level % len(self.levels)]
+        waves = level.get("waves", [])
+        return waves[wave_number - 1] if wave_number <= len(waves) else level.get("endless", [])
+
+    # Lazily yields (tick into the wave, (speed, health, color)) in spawn order. Enemies
+    # only get rolled when they're pulled, so a huge endless wave costs nothing up front.
+    def spawns(self, level, wave_number, rng):
+        streams = [self._group(group, wave_number, rng) for group in self.groups(level, wave_number)]
+        return heapq.merge(*streams, key=lambda spawn: spawn[0])
+
+    def _group(self, group, wave_number, rng):
+        archetype = self.archetypes[group["archetype"]]
+        count = group.get("count", 0) + group.get("per_wave", 0) * wave_number
+        delay, interval = group.get("delay", 0), group.get("interval", 0)
+        for i in range(count):
+            speed = rng.uniform(*archetype["speed"])
+            health = rng.randint(*archetype["health"])
+            color = rng.choice(archetype["colors"])
+            yield delay + i * interval, (speed, health, color)